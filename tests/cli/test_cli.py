@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """Tests for via_wind Command Line Interface commands"""
-import tempfile
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import json
 
 import pytest
@@ -27,104 +28,105 @@ def test_silouettes_happy(
     check_files_match,
     compare_images_approx,
     skip_content_check,
+    tmp_path,
 ):
     """
     Happy path test for the silouettes command. Tests that it produces the expected
     outputs for known inputs.
     """
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
-
-        # set up config data
-        config_data = {
-            "silouette_configs": test_config.as_posix(),
-        }
-        # write to json
-        config_path = tempdir_path.joinpath("config.json")
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
-
-        # run the command
-        result = test_cli_runner.invoke(
-            main,
-            ["silouettes", "-c", config_path.as_posix()],
-        )
-        assert result.exit_code == 0
 
-        # check all the expected outputs were created
-        output_path = tempdir_path.joinpath("silouettes")
-        outputs_match, difference = check_files_match(
-            "[!.]*", output_path, test_data_dir.joinpath("silouette_outputs")
+    # set up config data
+    config_data = {
+        "silouette_configs": test_config.as_posix(),
+    }
+    # write to json
+    config_path = tmp_path.joinpath("config.json")
+    config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
+
+    # run the command
+    result = test_cli_runner.invoke(
+        main,
+        ["silouettes", "-c", config_path.as_posix()],
+    )
+    assert result.exit_code == 0
+
+    # check all the expected outputs were created
+    output_path = tmp_path.joinpath("silouettes")
+    outputs_match, difference, output_files = check_files_match(
+        "[!.]*", output_path, test_data_dir.joinpath("silouette_outputs")
+    )
+    if not outputs_match:
+        raise AssertionError(
+            f"Output files do not match expected files. Difference is: {difference}"
         )
-        if not outputs_match:
-            raise AssertionError(
-                f"Output files do not match expected files. Difference is: {difference}"
+
+    # check outputs were created correctly
+    if not skip_content_check:
+        output_image_names = [f for f in output_files if f.suffix == ".png"]
+        output_images = [output_path.joinpath(n) for n in output_image_names]
+        test_images = [
+            test_data_dir.joinpath("silouette_outputs", n) for n in output_image_names
+        ]
+        # image comparisons are independent, so run them in parallel
+        compare = partial(compare_images_approx, hash_size=12, max_diff_pct=0.25)
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(compare, output_images, test_images, chunksize=4))
+
+        for output_image_name, (images_match, pct_diff) in zip(
+            output_image_names, results
+        ):
+            assert images_match, (
+                f"{output_image_name} does match expected image. "
+                f"Percent difference is: {round(pct_diff * 100, 2)}."
             )
 
-        # check outputs were created correctly
-        if not skip_content_check:
-            output_image_names = [
-                f.relative_to(output_path) for f in output_path.rglob("*.png")
-            ]
-            for output_image_name in output_image_names:
-                output_image = output_path.joinpath(output_image_name)
-                test_image = test_data_dir.joinpath(
-                    "silouette_outputs", output_image_name
-                )
-                images_match, pct_diff = compare_images_approx(
-                    output_image, test_image, hash_size=12, max_diff_pct=0.25
-                )
-                assert images_match, (
-                    f"{output_image_name} does match expected image. "
-                    f"Percent difference is: {round(pct_diff * 100, 2)}."
-                )
-
-
-def test_fov_happy(test_cli_runner, test_data_dir, check_files_match, compare_csv_data):
+
+def test_fov_happy(
+    test_cli_runner, test_data_dir, check_files_match, compare_csv_data, tmp_path
+):
     """
     Happy path test for the fov command. Tests that it produces the expected outputs for
     known inputs.
     """
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
+    # set up config data
+    silouette_directory = test_data_dir.joinpath("silouette_outputs", "test")
+    config_data = {"silouette_directories": silouette_directory.as_posix()}
+    # write to json
+    config_path = tmp_path.joinpath("config.json")
+    config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
 
-        # set up config data
-        silouette_directory = test_data_dir.joinpath("silouette_outputs", "test")
-        config_data = {"silouette_directories": silouette_directory.as_posix()}
-        # write to json
-        config_path = tempdir_path.joinpath("config.json")
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
+    result = test_cli_runner.invoke(
+        main,
+        ["fov", "-c", config_path.as_posix()],
+    )
+    assert result.exit_code == 0
 
-        result = test_cli_runner.invoke(
-            main,
-            ["fov", "-c", config_path.as_posix()],
+    # check all the expected outputs were created
+    output_path = tmp_path.joinpath("fov")
+    outputs_match, difference, output_files = check_files_match(
+        "[!.]*", output_path, test_data_dir.joinpath("fov_output")
+    )
+    if not outputs_match:
+        raise AssertionError(
+            f"Output files do not match expected files. Difference is: {difference}"
         )
-        assert result.exit_code == 0
 
-        # check all the expected outputs were created
-        output_path = tempdir_path.joinpath("fov")
-        outputs_match, difference = check_files_match(
-            "[!.]*", output_path, test_data_dir.joinpath("fov_output")
-        )
-        if not outputs_match:
-            raise AssertionError(
-                f"Output files do not match expected files. Difference is: {difference}"
-            )
-
-        # check output was created correctly
-        output_csv_names = [
-            f.relative_to(output_path) for f in output_path.rglob("*.csv")
-        ]
-        for output_csv_name in output_csv_names:
-            output_csv = output_path.joinpath(output_csv_name)
-            test_csv = test_data_dir.joinpath("fov_output", output_csv_name)
-            compare_csv_data(output_csv, test_csv)
+    # check output was created correctly
+    output_csv_names = [f for f in output_files if f.suffix == ".csv"]
+    for output_csv_name in output_csv_names:
+        output_csv = output_path.joinpath(output_csv_name)
+        test_csv = test_data_dir.joinpath("fov_output", output_csv_name)
+        compare_csv_data(output_csv, test_csv)
 
 
 def test_viewsheds_happy(
-    test_cli_runner, test_data_dir, raster_params, check_files_match
+    test_cli_runner,
+    test_data_dir,
+    raster_params,
+    check_files_match,
+    read_tif_cached,
+    tmp_path,
 ):
     """
     Happy path test for the viewsheds command. Tests that it produces the expected
@@ -145,342 +147,280 @@ def test_viewsheds_happy(
         raster_params["affine"], center_pixel, center_pixel
     )
 
-    turbine_attributes = [
-        # all of these are the same - equal to evaluating a single direction pointing N
-        {
-            "gid": 1,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 1.0,
-            "freq_winddir_45": 0.0,
-            "freq_winddir_90": 0.0,
-            "freq_winddir_135": 0.0,
-            "freq_winddir_180": 0.0,
-            "freq_winddir_225": 0.0,
-            "freq_winddir_270": 0.0,
-            "freq_winddir_315": 0.0,
-        },
-        {
-            "gid": 2,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 0.0,
-            "freq_winddir_45": 0.0,
-            "freq_winddir_90": 0.0,
-            "freq_winddir_135": 0.0,
-            "freq_winddir_180": 1.0,
-            "freq_winddir_225": 0.0,
-            "freq_winddir_270": 0.0,
-            "freq_winddir_315": 0.0,
-        },
-        {
-            "gid": 3,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 0.5,
-            "freq_winddir_45": 0.0,
-            "freq_winddir_90": 0.0,
-            "freq_winddir_135": 0.0,
-            "freq_winddir_180": 0.5,
-            "freq_winddir_225": 0.0,
-            "freq_winddir_270": 0.0,
-            "freq_winddir_315": 0.0,
-        },
-        {
-            "gid": 4,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 2,
-            "freq_winddir_45": 0.0,
-            "freq_winddir_90": 0.0,
-            "freq_winddir_135": 0.0,
-            "freq_winddir_180": 2,
-            "freq_winddir_225": 0.0,
-            "freq_winddir_270": 0.0,
-            "freq_winddir_315": 0.0,
-        },
-        # these two are the same equally weighted in all directions
-        {
-            "gid": 5,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 0.125,
-            "freq_winddir_45": 0.125,
-            "freq_winddir_90": 0.125,
-            "freq_winddir_135": 0.125,
-            "freq_winddir_180": 0.125,
-            "freq_winddir_225": 0.125,
-            "freq_winddir_270": 0.125,
-            "freq_winddir_315": 0.125,
-        },
-        {
-            "gid": 6,
-            "rd_m": 60.0,
-            "hh_m": 70.0,
-            "freq_winddir_0": 0.125,
-            "freq_winddir_45": 0.125,
-            "freq_winddir_90": 0.125,
-            "freq_winddir_135": 0.125,
-            "freq_winddir_180": 0.0,
-            "freq_winddir_225": 0.0,
-            "freq_winddir_270": 0.0,
-            "freq_winddir_315": 0.0,
-        },
-    ]
+    # wind direction frequencies for each turbine, with one column per direction
+    winddirs = (0, 45, 90, 135, 180, 225, 270, 315)
+    winddir_freqs = np.array(
+        [
+            # all of these are the same - equal to evaluating a single direction
+            # pointing N
+            [1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0],
+            [0.5, 0.0, 0.0, 0.0, 0.5, 0.0, 0.0, 0.0],
+            [2.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0],
+            # these two are the same equally weighted in all directions
+            [0.125] * 8,
+            [0.125, 0.125, 0.125, 0.125, 0.0, 0.0, 0.0, 0.0],
+        ]
+    )
+    n_turbines = winddir_freqs.shape[0]
+    turbine_attributes = {
+        "gid": np.arange(1, n_turbines + 1),
+        "rd_m": np.full(n_turbines, 60.0),
+        "hh_m": np.full(n_turbines, 70.0),
+    }
+    turbine_attributes.update(
+        {f"freq_winddir_{d}": winddir_freqs[:, i] for i, d in enumerate(winddirs)}
+    )
     turbines_df = gpd.GeoDataFrame(
         turbine_attributes,
-        geometry=[geometry.Point(*center_point)] * len(turbine_attributes),
+        geometry=[geometry.Point(*center_point)] * n_turbines,
         crs=raster_params["crs"].to_wkt(),
     )
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
-
-        # save out the elevation array to geotiff
-        elevation_tif = tempdir_path.joinpath("elevation.tif")
-        raster.save_to_geotiff(
-            array,
-            affine=raster_params["affine"],
-            crs=raster_params["crs"],
-            out_tif=elevation_tif,
-            nodata_value=None,
-        )
-        # save out the turbines to geopackage
-        turbines_path = tempdir_path.joinpath("turbines.gpkg")
-        turbines_df.to_file(turbines_path)
-
-        fov_lkup_fpath = test_data_dir.joinpath("viewsheds", "fov_lkup.csv")
-
-        # set up config data
-        config_data = {
-            "execution_control": {"nodes": 2},
-            "elev_fpath": elevation_tif.as_posix(),
-            "turbines_fpath": turbines_path.as_posix(),
-            "fov_lkup_fpath": fov_lkup_fpath.as_posix(),
-            "max_dist_km": max_distance_km,
-            "obstruction_interval_m": 10,
-            "viewer_height_m": 1.75,
-        }
-        # write to json
-        config_path = tempdir_path.joinpath("config.json")
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
-
-        # run the command
-        result = test_cli_runner.invoke(
-            main,
-            ["viewsheds", "-c", config_path.as_posix()],
-        )
-        assert result.exit_code == 0
+    # save out the elevation array to geotiff
+    elevation_tif = tmp_path.joinpath("elevation.tif")
+    raster.save_to_geotiff(
+        array,
+        affine=raster_params["affine"],
+        crs=raster_params["crs"],
+        out_tif=elevation_tif,
+        nodata_value=None,
+    )
+    # save out the turbines to flatgeobuf (much faster to write than geopackage
+    # for a handful of features)
+    turbines_path = tmp_path.joinpath("turbines.fgb")
+    turbines_df.to_file(turbines_path, driver="FlatGeobuf", engine="pyogrio")
+
+    fov_lkup_fpath = test_data_dir.joinpath("viewsheds", "fov_lkup.csv")
+
+    # set up config data
+    config_data = {
+        "execution_control": {"nodes": 2},
+        "elev_fpath": elevation_tif.as_posix(),
+        "turbines_fpath": turbines_path.as_posix(),
+        "fov_lkup_fpath": fov_lkup_fpath.as_posix(),
+        "max_dist_km": max_distance_km,
+        "obstruction_interval_m": 10,
+        "viewer_height_m": 1.75,
+    }
+    # write to json
+    config_path = tmp_path.joinpath("config.json")
+    config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
+
+    # run the command
+    result = test_cli_runner.invoke(
+        main,
+        ["viewsheds", "-c", config_path.as_posix()],
+    )
+    assert result.exit_code == 0
 
-        output_path = tempdir_path.joinpath("viewsheds")
-        # check that the same outputs are created
-        expected_results_path = test_data_dir.joinpath("viewsheds", "expected_results")
-        outputs_match, difference = check_files_match(
-            "*.tif", output_path, expected_results_path
+    output_path = tmp_path.joinpath("viewsheds")
+    # check that the same outputs are created
+    expected_results_path = test_data_dir.joinpath("viewsheds", "expected_results")
+    outputs_match, difference, output_files = check_files_match(
+        "*.tif", output_path, expected_results_path
+    )
+    if not outputs_match:
+        raise AssertionError(
+            f"Output files do not match expected files. Difference is: {difference}"
         )
-        if not outputs_match:
-            raise AssertionError(
-                f"Output files do not match expected files. Difference is: {difference}"
-            )
 
-        # check the resulting tif is the same
-        result_tifs = output_path.rglob("fov-pct*.tif")
-        for result_tif in result_tifs:
-            expected_tif = expected_results_path.joinpath(result_tif.name)
-            with (
-                rasterio.open(result_tif, "r") as rast1,
-                rasterio.open(expected_tif, "r") as rast2,
-            ):
-                assert np.allclose(rast1.read(), rast2.read())
+    # check the resulting tif is the same
+    result_tifs = [f for f in output_files if f.name.startswith("fov-pct")]
+    for result_tif in result_tifs:
+        expected_tif = expected_results_path.joinpath(result_tif.name)
+        with rasterio.open(output_path.joinpath(result_tif), "r") as rast:
+            assert np.allclose(rast.read(), read_tif_cached(expected_tif))
 
 
-def test_merge_happy(test_cli_runner, test_data_dir):
+def test_merge_happy(
+    test_cli_runner,
+    test_data_dir,
+    read_tif_cached,
+    skip_content_check,
+    tmp_path,
+):
     """
     Happy path test for the merge command. Tests that it produces the expected
     outputs for known inputs.
     """
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
+    # copy test FOV output to two identical new rasters for merging
+    inputs_path = test_data_dir.joinpath("vrt", "inputs")
 
-        # copy test FOV output to two identical new rasters for merging
-        inputs_path = test_data_dir.joinpath("vrt", "inputs")
+    # set up config data
+    inputs_path = test_data_dir.joinpath("vrt", "inputs")
+    config_data = {"viewsheds_directory": inputs_path.as_posix(), "block_size": 50}
+    # write to json
+    config_path = tmp_path.joinpath("config.json")
+    config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
 
-        # set up config data
-        inputs_path = test_data_dir.joinpath("vrt", "inputs")
-        config_data = {"viewsheds_directory": inputs_path.as_posix(), "block_size": 50}
-        # write to json
-        config_path = tempdir_path.joinpath("config.json")
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
+    result = test_cli_runner.invoke(
+        main,
+        ["merge", "-c", config_path.as_posix()],
+    )
+    assert result.exit_code == 0
 
-        result = test_cli_runner.invoke(
-            main,
-            ["merge", "-c", config_path.as_posix()],
+    output_path = tmp_path.joinpath("viewsheds_merge")
+    output_files = [f.relative_to(output_path) for f in output_path.rglob("[!.]*.*")]
+    expected_outputs = [
+        Path("fov-pct_sum.tif"),
+        Path("sources.vrt"),
+        Path("blocks/block_0_0.tif"),
+        Path("blocks/block_0_50.tif"),
+        Path("blocks/block_0_100.tif"),
+        Path("blocks/block_50_0.tif"),
+        Path("blocks/block_50_50.tif"),
+        Path("blocks/block_50_100.tif"),
+        Path("blocks/block_100_0.tif"),
+        Path("blocks/block_100_50.tif"),
+        Path("blocks/block_100_100.tif"),
+    ]
+    difference = list(set(output_files).symmetric_difference(set(expected_outputs)))
+    if len(difference) != 0:
+        raise AssertionError(
+            f"Output files do not match expected files. Difference is: {difference}"
         )
-        assert result.exit_code == 0
 
-        output_path = tempdir_path.joinpath("viewsheds_merge")
-        output_files = [
-            f.relative_to(output_path) for f in output_path.rglob("[!.]*.*")
-        ]
-        expected_outputs = [
-            Path("fov-pct_sum.tif"),
-            Path("sources.vrt"),
-            Path("blocks/block_0_0.tif"),
-            Path("blocks/block_0_50.tif"),
-            Path("blocks/block_0_100.tif"),
-            Path("blocks/block_50_0.tif"),
-            Path("blocks/block_50_50.tif"),
-            Path("blocks/block_50_100.tif"),
-            Path("blocks/block_100_0.tif"),
-            Path("blocks/block_100_50.tif"),
-            Path("blocks/block_100_100.tif"),
-        ]
-        difference = list(set(output_files).symmetric_difference(set(expected_outputs)))
-        if len(difference) != 0:
-            raise AssertionError(
-                f"Output files do not match expected files. Difference is: {difference}"
-            )
-
-        # the input rasters are identical, so the output raster should be equal to
-        # 2 * either of the the inputs
+    # the input rasters are identical, so the output raster should be equal to
+    # 2 * either of the the inputs
+    if not skip_content_check:
         out_sum_tif = output_path.joinpath("fov-pct_sum.tif")
         viewsheds_tif = inputs_path.joinpath("fov-pct_gid1.tif")
-        with rasterio.open(viewsheds_tif, "r") as rast:
-            expected_array = rast.read()
+        expected_array = read_tif_cached(viewsheds_tif) * 2
 
-        expected_array *= 2
         with rasterio.open(out_sum_tif, "r") as rast:
             result_array = rast.read()
 
-        assert np.array_equal(expected_array, result_array)
+        np.testing.assert_array_equal(result_array, expected_array)
 
 
-def test_calibrate_happy(test_cli_runner, test_data_dir):
+def test_calibrate_happy(
+    test_cli_runner,
+    test_data_dir,
+    read_tif_cached,
+    skip_content_check,
+    tmp_path,
+):
     """
     Happy path test for the calibrate command. Tests that it produces the expected
     outputs for known inputs.
     """
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
-
-        # set up config for merge step
-        inputs_path = test_data_dir.joinpath("vrt", "inputs")
-        merge_config_data = {
-            "viewsheds_directory": inputs_path.as_posix(),
-            "block_size": 50,
-        }
-        # write to json
-        merge_config_path = tempdir_path.joinpath("config_merge.json")
-        with open(merge_config_path, "w") as f:
-            json.dump(merge_config_data, f)
-        # run merge
-        result = test_cli_runner.invoke(
-            main,
-            ["merge", "-c", merge_config_path.as_posix()],
-        )
-        assert result.exit_code == 0
-
-        # set up config for calibrate step
-        inputs_path = test_data_dir.joinpath("vrt", "inputs")
-        calibrate_config_data = {
-            "merge_directory": tempdir_path.joinpath("viewsheds_merge").as_posix()
-        }
-        # write to json
-        calibrate_config_path = tempdir_path.joinpath("config_calibrate.json")
-        with open(calibrate_config_path, "w") as f:
-            json.dump(calibrate_config_data, f)
-        # run calibrate
-        result = test_cli_runner.invoke(
-            main,
-            ["calibrate", "-c", calibrate_config_path.as_posix()],
-        )
-        assert result.exit_code == 0
+    # set up config for merge step
+    inputs_path = test_data_dir.joinpath("vrt", "inputs")
+    merge_config_data = {
+        "viewsheds_directory": inputs_path.as_posix(),
+        "block_size": 50,
+    }
+    # write to json
+    merge_config_path = tmp_path.joinpath("config_merge.json")
+    merge_config_path.write_bytes(json.dumps(merge_config_data).encode("utf-8"))
+    # run merge
+    result = test_cli_runner.invoke(
+        main,
+        ["merge", "-c", merge_config_path.as_posix()],
+    )
+    assert result.exit_code == 0
 
-        output_path = tempdir_path.joinpath("viewsheds_calibrated")
-        output_files = [
-            f.relative_to(output_path) for f in output_path.rglob("[!.]*.*")
-        ]
-        expected_outputs = [
-            Path("visual_impact.tif"),
-            Path("blocks/block_0_0.tif"),
-            Path("blocks/block_0_50.tif"),
-            Path("blocks/block_0_100.tif"),
-            Path("blocks/block_50_0.tif"),
-            Path("blocks/block_50_50.tif"),
-            Path("blocks/block_50_100.tif"),
-            Path("blocks/block_100_0.tif"),
-            Path("blocks/block_100_50.tif"),
-            Path("blocks/block_100_100.tif"),
-        ]
-        difference = list(set(output_files).symmetric_difference(set(expected_outputs)))
-        if len(difference) != 0:
-            raise AssertionError(
-                f"Output files do not match expected files. Difference is: {difference}"
-            )
+    # set up config for calibrate step
+    inputs_path = test_data_dir.joinpath("vrt", "inputs")
+    calibrate_config_data = {
+        "merge_directory": tmp_path.joinpath("viewsheds_merge").as_posix()
+    }
+    # write to json
+    calibrate_config_path = tmp_path.joinpath("config_calibrate.json")
+    calibrate_config_path.write_bytes(
+        json.dumps(calibrate_config_data).encode("utf-8")
+    )
+    # run calibrate
+    result = test_cli_runner.invoke(
+        main,
+        ["calibrate", "-c", calibrate_config_path.as_posix()],
+    )
+    assert result.exit_code == 0
+
+    output_path = tmp_path.joinpath("viewsheds_calibrated")
+    output_files = [f.relative_to(output_path) for f in output_path.rglob("[!.]*.*")]
+    expected_outputs = [
+        Path("visual_impact.tif"),
+        Path("blocks/block_0_0.tif"),
+        Path("blocks/block_0_50.tif"),
+        Path("blocks/block_0_100.tif"),
+        Path("blocks/block_50_0.tif"),
+        Path("blocks/block_50_50.tif"),
+        Path("blocks/block_50_100.tif"),
+        Path("blocks/block_100_0.tif"),
+        Path("blocks/block_100_50.tif"),
+        Path("blocks/block_100_100.tif"),
+    ]
+    difference = list(set(output_files).symmetric_difference(set(expected_outputs)))
+    if len(difference) != 0:
+        raise AssertionError(
+            f"Output files do not match expected files. Difference is: {difference}"
+        )
 
+    if not skip_content_check:
         expected_ratings_tif = test_data_dir.joinpath(
             "calibrate", "expected_results", "visual_impact.tif"
         )
-        with rasterio.open(expected_ratings_tif, "r") as rast:
-            expected_array = rast.read()
+        expected_array = read_tif_cached(expected_ratings_tif)
 
         output_ratings_tif = output_path.joinpath("visual_impact.tif")
         with rasterio.open(output_ratings_tif, "r") as rast:
             result_array = rast.read()
 
-        assert np.array_equal(expected_array, result_array)
+        np.testing.assert_array_equal(result_array, expected_array)
 
 
-def test_mask_happy(test_cli_runner, test_data_dir):
+def test_mask_happy(
+    test_cli_runner,
+    test_data_dir,
+    read_tif_cached,
+    skip_content_check,
+    tmp_path,
+):
     """
     Happy path test for the mask command. Tests that it produces the expected output for
     known inputs.
     """
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        tempdir_path = Path(tempdir)
-
-        # set up config for merge step
-        in_raster = test_data_dir.joinpath(
-            "calibrate", "expected_results/visual_impact.tif"
-        )
-        mask_raster = test_data_dir.joinpath(
-            "mask", "no_vis_mask.tif"
-        )
+    # set up config for merge step
+    in_raster = test_data_dir.joinpath(
+        "calibrate", "expected_results/visual_impact.tif"
+    )
+    mask_raster = test_data_dir.joinpath(
+        "mask", "no_vis_mask.tif"
+    )
 
-        config_data = {
-            "input_raster": in_raster.as_posix(),
-            "mask_raster": mask_raster.as_posix(),
-        }
-        # write to json
-        config_path = tempdir_path.joinpath("config.json")
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
-
-        result = test_cli_runner.invoke(
-            main,
-            ["mask", "-c", config_path.as_posix()],
-        )
-        assert result.exit_code == 0
+    config_data = {
+        "input_raster": in_raster.as_posix(),
+        "mask_raster": mask_raster.as_posix(),
+    }
+    # write to json
+    config_path = tmp_path.joinpath("config.json")
+    config_path.write_bytes(json.dumps(config_data).encode("utf-8"))
+
+    result = test_cli_runner.invoke(
+        main,
+        ["mask", "-c", config_path.as_posix()],
+    )
+    assert result.exit_code == 0
 
-        output_path = tempdir_path.joinpath("mask")
-        masked_tif = output_path.joinpath(in_raster.name)
-        assert masked_tif.exists(), f"Expected output raster {masked_tif} not created"
+    output_path = tmp_path.joinpath("mask")
+    masked_tif = output_path.joinpath(in_raster.name)
+    assert masked_tif.exists(), f"Expected output raster {masked_tif} not created"
 
+    if not skip_content_check:
         expected_mask_tif = test_data_dir.joinpath(
             "mask", "expected_results", "visual_impact.tif"
         )
-        with rasterio.open(expected_mask_tif, "r") as rast:
-            expected_array = rast.read()
+        expected_array = read_tif_cached(expected_mask_tif)
 
         with rasterio.open(masked_tif, "r") as rast:
             result_array = rast.read()
 
-        assert np.array_equal(expected_array, result_array)
+        np.testing.assert_array_equal(result_array, expected_array)
 
 if __name__ == "__main__":
     pytest.main([__file__, "-s", "--skip_content_check"])
@@ -2,11 +2,15 @@
 """Pytest fixtures"""
 from pathlib import Path
 import argparse
+import copy
 
 import pytest
 from click.testing import CliRunner
 import numpy as np
+from imageio.v3 import imread
 import rasterio
+import geopandas as gpd
+from shapely import geometry
 import utils
 
 
@@ -21,7 +25,7 @@ def test_cli_runner():
     return CliRunner()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config():
     """Return path to simple test configuration file."""
     return CONFIGS_DIR.joinpath("test_config.json")
@@ -33,6 +37,13 @@ def compare_images_approx():
     return utils.compare_images_approx
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _clear_image_cache():
+    """Releases the decoded images cached by compare_images_approx after the session"""
+    yield
+    utils._load_gray.cache_clear()  # pylint: disable=protected-access
+
+
 @pytest.fixture
 def check_files_match():
     """Exposes the check_files_match function as a fixture"""
@@ -45,12 +56,43 @@ def compare_csv_data():
     return utils.compare_csv_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def read_tif_cached():
+    """Exposes the read_tif_cached function as a fixture"""
+    return utils.read_tif_cached
+
+
+@pytest.fixture(scope="session")
 def test_data_dir():
     """Return path to test data directory"""
     return TESTS_DIR.joinpath("data")
 
 
+@pytest.fixture(scope="session")
+def points_fpath(tmp_path_factory):
+    """
+    Returns path to a dataset of 100 points, written once per test session. Tests
+    should treat this file as read-only.
+    """
+    df = gpd.GeoDataFrame(geometry=[geometry.Point(0, 0)] * 100, crs="EPSG:4326")
+    out_fgb = tmp_path_factory.mktemp("points").joinpath("points.fgb")
+    df.to_file(out_fgb, driver="FlatGeobuf", engine="pyogrio")
+
+    return out_fgb
+
+
+@pytest.fixture(scope="session")
+def intensity_images():
+    """
+    Returns dictionary of the decoded intensity test images, keyed by file stem (i.e.,
+    the expected intensity percentage). Images are decoded once per test session.
+    """
+    images_path = TESTS_DIR.joinpath("data", "intensity_images")
+    images = {p.stem: imread(p) for p in images_path.glob("*.png")}
+
+    return images
+
+
 @pytest.fixture
 def degree_radian_pairs():
     """Returns list of tuples for known degree/radian equivalents"""
@@ -65,9 +107,12 @@ def degree_radian_pairs():
     return deg_rad
 
 
-@pytest.fixture
-def turbine_params_dict():
-    """Returns dictionary containing valid turbine configuration parameters"""
+@pytest.fixture(scope="session")
+def _base_turbine_params_dict():
+    """
+    Returns dictionary containing valid turbine configuration parameters, built once
+    per test session. Tests should use turbine_params_dict, which returns a copy.
+    """
     params_dict = {
         "blade_chord_m": 1.95,
         "distances_to_camera_m": [1000, 5000],
@@ -83,8 +128,17 @@ def turbine_params_dict():
 
 
 @pytest.fixture
-def camera_params_dict():
-    """Returns dictionary containing valid turbine camera parameters"""
+def turbine_params_dict(_base_turbine_params_dict):
+    """Returns dictionary containing valid turbine configuration parameters"""
+    return copy.deepcopy(_base_turbine_params_dict)
+
+
+@pytest.fixture(scope="session")
+def _base_camera_params_dict():
+    """
+    Returns dictionary containing valid turbine camera parameters, built once per test
+    session. Tests should use camera_params_dict, which returns a copy.
+    """
     params_dict = {
         "film_width_mm": 35,
         "height_m": 1.75,
@@ -97,9 +151,16 @@ def camera_params_dict():
 
 
 @pytest.fixture
-def raster_params():
+def camera_params_dict(_base_camera_params_dict):
+    """Returns dictionary containing valid turbine camera parameters"""
+    return copy.deepcopy(_base_camera_params_dict)
+
+
+@pytest.fixture(scope="session")
+def _base_raster_params():
     """
-    Returns a dictionary containing parameters that can be used to mock a raster.
+    Returns a dictionary containing parameters that can be used to mock a raster, built
+    once per test session. Tests should use raster_params, which returns a copy.
     """
     params = {
         "nodata": 0,
@@ -115,6 +176,14 @@ def raster_params():
     return params
 
 
+@pytest.fixture
+def raster_params(_base_raster_params):
+    """
+    Returns a dictionary containing parameters that can be used to mock a raster.
+    """
+    return copy.deepcopy(_base_raster_params)
+
+
 def pytest_addoption(parser):
     """
     Adds a pytest CLI option that enables running tests while skipping detailed checking
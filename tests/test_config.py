@@ -52,6 +52,21 @@ def test_turbineparams_bad_subelement_dtype(turbine_params_dict):
         )
 
 
+@pytest.mark.parametrize(
+    "distances_to_camera_m", [[1000, "5000"], [1000, None], [[1000], [5000]]]
+)
+def test_turbineparams_bad_numeric_subelement_dtype(
+    turbine_params_dict, distances_to_camera_m
+):
+    """
+    Test that TurbineParams class raises a TypeError when a list of numbers parameter
+    has subelements that are not numbers.
+    """
+    turbine_params_dict["distances_to_camera_m"] = distances_to_camera_m
+    with pytest.raises(TypeError, match="elements must be type"):
+        TurbineParams(turbine_params_dict)
+
+
 def test_cameraparams_happy(camera_params_dict):
     """
     Happy path unit test for CameraParams class: load a valid dictionary of
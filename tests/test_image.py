@@ -3,23 +3,44 @@
 import math
 
 import pytest
+import numpy as np
 
 from via_wind import image
 
 
-def test_mean_image_intensity_math(test_data_dir):
+@pytest.mark.parametrize("intensity_pct", ["0", "20", "25", "50", "75", "80", "100"])
+def test_mean_image_intensity_math(intensity_images, intensity_pct):
     """
     Unit test for mean_image_intensity function to verify that it produces the
     expected image intensity values when passed known images that are e.g., entirely
     black, entirely white, 50%, 25%, etc.
     """
+    intensity = float(intensity_pct) / 100
+    assert math.isclose(
+        image.mean_image_intensity(intensity_images[intensity_pct]),
+        intensity,
+        abs_tol=1e-2,
+    )
 
-    image_paths = test_data_dir.joinpath("intensity_images").glob("*.png")
-    for image_path in image_paths:
-        intensity = float(image_path.name.replace(".png", "")) / 100
-        assert math.isclose(
-            image.mean_image_intensity(image_path), intensity, abs_tol=1e-2
-        )
+
+def test_mean_image_intensity_path(test_data_dir):
+    """
+    Unit test for mean_image_intensity function to verify that it produces the
+    expected image intensity value when passed the path to an image.
+    """
+    image_path = test_data_dir.joinpath("intensity_images", "50.png")
+    assert math.isclose(image.mean_image_intensity(image_path), 0.5, abs_tol=1e-2)
+
+
+def test_mean_image_intensity_float_array():
+    """
+    Unit test for mean_image_intensity function to verify that it produces the
+    expected image intensity value when passed a floating point array, including
+    fractional and negative pixel values.
+    """
+    image_array = np.array([[0.0, 127.5], [255.0, -25.5]])
+    expected_intensity = np.mean((255 - image_array) / 255)
+    assert math.isclose(image.mean_image_intensity(image_array), expected_intensity)
 
 
 def test_mean_image_intensity_rgb(test_data_dir):
@@ -8,80 +8,78 @@ import numpy as np
 from via_wind import measures
 
 
-def test_calc_distance_and_direction_symmetric_square():
+@pytest.mark.parametrize("shape", [(101, 101), (25, 25), (3, 3)])
+def test_calc_distance_and_direction_symmetric_square(shape):
     """
     Unit tests for calc_distance_and_direction under the most common and simplest
     case where the input shape is square and has a center pixel (i.e., has an odd
     number of rows and columns)
     """
 
-    shapes = [(101, 101), (25, 25), (3, 3)]
-    for shape in shapes:
-        distance, direction = measures.calc_distance_and_direction(shape)
-
-        assert direction[0, shape[1] // 2] == 0
-        # due west
-        assert direction[shape[0] // 2, 0] == 270
-        # due east
-        assert direction[shape[0] // 2, -1] == 90
-        # due south
-        assert direction[-1, shape[1] // 2] == 180
-        # northeast
-        assert direction[0, -1] == 45
-        # southeast
-        assert direction[-1, -1] == 135
-        # southwest
-        assert direction[-1, 0] == 225
-        # northwest
-        assert direction[0, 0] == 315
-
-        assert distance[0, shape[1] // 2] == shape[0] // 2
-        # due west
-        assert distance[shape[0] // 2, 0] == shape[1] // 2
-        # due east
-        assert distance[shape[0] // 2, -1] == shape[1] // 2
-        # due south
-        assert distance[-1, shape[1] // 2] == shape[0] // 2
-
-
-def test_calc_distance_and_direction_nonsymmetric_square():
+    distance, direction = measures.calc_distance_and_direction(shape)
+
+    assert direction[0, shape[1] // 2] == 0
+    # due west
+    assert direction[shape[0] // 2, 0] == 270
+    # due east
+    assert direction[shape[0] // 2, -1] == 90
+    # due south
+    assert direction[-1, shape[1] // 2] == 180
+    # northeast
+    assert direction[0, -1] == 45
+    # southeast
+    assert direction[-1, -1] == 135
+    # southwest
+    assert direction[-1, 0] == 225
+    # northwest
+    assert direction[0, 0] == 315
+
+    assert distance[0, shape[1] // 2] == shape[0] // 2
+    # due west
+    assert distance[shape[0] // 2, 0] == shape[1] // 2
+    # due east
+    assert distance[shape[0] // 2, -1] == shape[1] // 2
+    # due south
+    assert distance[-1, shape[1] // 2] == shape[0] // 2
+
+
+@pytest.mark.parametrize("shape", [(100, 100), (24, 24), (4, 4)])
+def test_calc_distance_and_direction_nonsymmetric_square(shape):
     """
     Unit tests for calc_distance_and_direction under the case where the input shape is
     square, but does not have a center pixel (i.e., has an even number of rows and
     columns)
     """
 
-    shapes = [(100, 100), (24, 24), (4, 4)]
-    for shape in shapes:
-        distance, direction = measures.calc_distance_and_direction(shape)
-
-        # check direction
-        # northeast
-        assert direction[0, -1] == 45
-        # southeast
-        assert direction[-1, -1] == 135
-        # southwest
-        assert direction[-1, 0] == 225
-        # northwest
-        assert direction[0, 0] == 315
-
-        # check distance
-        # due north
-        assert math.isclose(
-            distance[0, shape[1] // 2], shape[0] / 2 - 0.5, abs_tol=1e-1
-        )
-        # due west
-        assert math.isclose(
-            distance[shape[0] // 2, 0], shape[1] / 2 - 0.5, abs_tol=1e-1
-        )
-        # due east
-        assert math.isclose(
-            distance[shape[0] // 2, -1], shape[1] / 2 - 0.5, abs_tol=1e-1
-        )
-        # due south
-        assert math.isclose(
-            distance[-1, shape[1] // 2], shape[0] / 2 - 0.5, abs_tol=1e-1
-        )
+    distance, direction = measures.calc_distance_and_direction(shape)
+
+    # check direction
+    # northeast
+    assert direction[0, -1] == 45
+    # southeast
+    assert direction[-1, -1] == 135
+    # southwest
+    assert direction[-1, 0] == 225
+    # northwest
+    assert direction[0, 0] == 315
+
+    # check distance
+    # due north
+    assert math.isclose(
+        distance[0, shape[1] // 2], shape[0] / 2 - 0.5, abs_tol=1e-1
+    )
+    # due west
+    assert math.isclose(
+        distance[shape[0] // 2, 0], shape[1] / 2 - 0.5, abs_tol=1e-1
+    )
+    # due east
+    assert math.isclose(
+        distance[shape[0] // 2, -1], shape[1] / 2 - 0.5, abs_tol=1e-1
+    )
+    # due south
+    assert math.isclose(
+        distance[-1, shape[1] // 2], shape[0] / 2 - 0.5, abs_tol=1e-1
+    )
 
 
 @pytest.mark.parametrize("shape", [(500, 101), (10, 100), (4, 6)])
@@ -136,6 +134,25 @@ def test_calc_distance_and_direction_any_shape(shape):
     )
 
 
+def test_calc_distance_and_direction_cached_copies():
+    """
+    Unit test for calc_distance_and_direction to ensure that repeated calls return
+    equal results and that modifying the returned arrays does not affect the cached
+    results returned by subsequent calls.
+    """
+    shape = (25, 25)
+    distance, direction = measures.calc_distance_and_direction(shape)
+    expected_distance = distance.copy()
+    expected_direction = direction.copy()
+
+    distance *= 30
+    direction[:] = 0
+
+    distance, direction = measures.calc_distance_and_direction(shape)
+    assert np.array_equal(distance, expected_distance)
+    assert np.array_equal(direction, expected_direction)
+
+
 @pytest.mark.parametrize(
     "direction_from_turbine,turbine_bearing,lookangle", [
         (270, 0, 90),
@@ -215,13 +232,9 @@ def test_calc_lookangle_multivalue_array():
         (415, 55),
     ]
 
-    direction_from_turbine = np.zeros(shape)
-    lookangle = np.zeros(shape)
-
-    for i, values in enumerate(test_values):
-        direction_from_turbine_val, lookangle_val = values
-        direction_from_turbine[i, :] = direction_from_turbine_val
-        lookangle[i, :] = lookangle_val
+    test_values = np.asarray(test_values, dtype="float64")
+    direction_from_turbine = np.broadcast_to(test_values[:, 0:1], shape)
+    lookangle = np.broadcast_to(test_values[:, 1:2], shape)
 
     result = measures.calc_lookangle(
         direction_from_turbine=direction_from_turbine, turbine_bearing=turbine_bearing
@@ -229,64 +242,60 @@ def test_calc_lookangle_multivalue_array():
     assert np.isclose(result, lookangle, atol=1e-3).all()
 
 
-def test_classify_lookangle_floats():
-    """
-    Tests classify lookangle floats produces expected values when inputs are floats
-    """
-    turbine_bearings = [0, 90, 225, 315]
-    directions_from_turbine = [0, 45, 90, 135, 180, 225, 270, 315]
-
-    expected_results = [
+@pytest.mark.parametrize(
+    "turbine_bearing,direction_from_turbine,expected_result", [
         # turbine bearing = 0
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
+        (0, 0, "FRONT"),
+        (0, 45, "DIAGONAL"),
+        (0, 90, "SIDE"),
+        (0, 135, "DIAGONAL"),
+        (0, 180, "FRONT"),
+        (0, 225, "DIAGONAL"),
+        (0, 270, "SIDE"),
+        (0, 315, "DIAGONAL"),
         # turbine bearing = 90
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
+        (90, 0, "SIDE"),
+        (90, 45, "DIAGONAL"),
+        (90, 90, "FRONT"),
+        (90, 135, "DIAGONAL"),
+        (90, 180, "SIDE"),
+        (90, 225, "DIAGONAL"),
+        (90, 270, "FRONT"),
+        (90, 315, "DIAGONAL"),
         # turbine bearing = 225
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
+        (225, 0, "DIAGONAL"),
+        (225, 45, "FRONT"),
+        (225, 90, "DIAGONAL"),
+        (225, 135, "SIDE"),
+        (225, 180, "DIAGONAL"),
+        (225, 225, "FRONT"),
+        (225, 270, "DIAGONAL"),
+        (225, 315, "SIDE"),
         # turbine bearing = 315
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
-        "DIAGONAL",
-        "SIDE",
-        "DIAGONAL",
-        "FRONT",
+        (315, 0, "DIAGONAL"),
+        (315, 45, "SIDE"),
+        (315, 90, "DIAGONAL"),
+        (315, 135, "FRONT"),
+        (315, 180, "DIAGONAL"),
+        (315, 225, "SIDE"),
+        (315, 270, "DIAGONAL"),
+        (315, 315, "FRONT"),
     ]
-
+)
+def test_classify_lookangle_floats(
+    turbine_bearing, direction_from_turbine, expected_result
+):
+    """
+    Tests classify lookangle floats produces expected values when inputs are floats
+    """
     lookangles = {1: "FRONT", 2: "DIAGONAL", 3: "SIDE", -1: "UNKNOWN"}
 
-    i = 0
-    for turbine_bearing in turbine_bearings:
-        for direction_from_turbine in directions_from_turbine:
-            result = measures.classify_look_angle(
-                direction_from_turbine=direction_from_turbine,
-                turbine_bearing=turbine_bearing,
-            )
-            view = lookangles[result[0]]
-            assert view == expected_results[i]
-            i += 1
+    result = measures.classify_look_angle(
+        direction_from_turbine=direction_from_turbine,
+        turbine_bearing=turbine_bearing,
+    )
+    view = lookangles[result[0]]
+    assert view == expected_result
 
 
 def test_classify_lookangle_array():
@@ -300,11 +309,12 @@ def test_classify_lookangle_array():
     expected_result_values = [3, 2, 1, 2, 3, 2, 1, 2]
     shape = (len(directions_from_turbine_values), len(directions_from_turbine_values))
 
-    direction_from_turbine = np.zeros(shape)
-    expected_result = np.zeros(shape, dtype="int")
-    for i, value in enumerate(directions_from_turbine_values):
-        direction_from_turbine[:, i] = value
-        expected_result[:, i] = expected_result_values[i]
+    direction_from_turbine = np.tile(
+        np.asarray(directions_from_turbine_values, dtype="float64"), (shape[0], 1)
+    )
+    expected_result = np.tile(
+        np.asarray(expected_result_values, dtype="int8"), (shape[0], 1)
+    )
 
     result = measures.classify_look_angle(
         direction_from_turbine=direction_from_turbine, turbine_bearing=turbine_bearing
@@ -320,5 +330,18 @@ def test_calc_lookangle_floating_point_error():
     assert np.array_equal(measures.calc_lookangle(225, 225), np.array([0]))
 
 
+def test_calc_lookangle_range():
+    """
+    Unit test for calc_lookangle() to ensure that results are always finite and within
+    the range [0, 180] for a dense sweep of directions and bearings, including values
+    outside of [0, 360).
+    """
+    direction_from_turbine = np.linspace(-360, 720, 10801)
+    for turbine_bearing in [0, 22.5, 45, 180, 225, 359.9, 450]:
+        result = measures.calc_lookangle(direction_from_turbine, turbine_bearing)
+        assert np.isfinite(result).all()
+        assert (result >= 0).all() and (result <= 180).all()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
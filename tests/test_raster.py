@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 """Unit tests for via_wind.raster module"""
-import tempfile
-from pathlib import Path
 import shutil
 
 import pytest
 import rasterio
+from rasterio.windows import Window
 import numpy as np
+import geopandas as gpd
 from shapely.geometry import box
 
 from via_wind import raster
@@ -20,21 +20,19 @@ def test_save_to_geotiff(raster_params):
     array = np.ones(raster_params["shape"], dtype="float32")
     array[0, :] = raster_params["nodata"]
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
+    with rasterio.MemoryFile() as memfile:
         tags = {"TEST": "VALUE"}
-        out_tif = output_directory.joinpath("test.tif")
         raster.save_to_geotiff(
             array,
             affine=raster_params["affine"],
             crs=raster_params["crs"],
-            out_tif=out_tif,
+            out_tif=memfile.name,
             nodata_value=raster_params["nodata"],
             tags=tags,
         )
 
         # open the raster and check everything is as expected
-        with rasterio.open(out_tif, "r") as rast:
+        with memfile.open() as rast:
             assert rast.crs == raster_params["crs"]
             assert rast.res == (
                 raster_params["resolution"],
@@ -58,15 +56,13 @@ def test_save_to_geotiff_bad_dtype(raster_params):
     """
     array = np.ones(raster_params["shape"], dtype="bool")
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
-        out_tif = output_directory.joinpath("test.tif")
+    with rasterio.MemoryFile() as memfile:
         with pytest.raises(TypeError) as exc_info:
             raster.save_to_geotiff(
                 array,
                 affine=raster_params["affine"],
                 crs=raster_params["crs"],
-                out_tif=out_tif,
+                out_tif=memfile.name,
                 nodata_value=raster_params["nodata"],
             )
             assert exc_info.startswith("Invalid array dtype:")
@@ -78,18 +74,16 @@ def test_get_raster_info(raster_params):
     check that get_raster_info() returns the correct crs and resolution.
     """
     array = np.ones(raster_params["shape"], dtype="int8")
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
-        out_tif = output_directory.joinpath("test.tif")
+    with rasterio.MemoryFile() as memfile:
         raster.save_to_geotiff(
             array,
             affine=raster_params["affine"],
             crs=raster_params["crs"],
-            out_tif=out_tif,
+            out_tif=memfile.name,
             nodata_value=raster_params["nodata"],
         )
 
-        raster_info = raster.get_raster_info(out_tif)
+        raster_info = raster.get_raster_info(memfile.name)
         assert raster_info["crs"] == raster_params["crs"]
         assert raster_info["resolution"] == raster_params["resolution"]
 
@@ -103,19 +97,17 @@ def test_get_raster_info_bad_resolution(raster_params):
     affine = raster_params["affine"]
     new_affine = rasterio.Affine(35, affine.b, affine.c, affine.d, affine.e, affine.f)
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
-        out_tif = output_directory.joinpath("test.tif")
+    with rasterio.MemoryFile() as memfile:
         raster.save_to_geotiff(
             array,
             affine=new_affine,
             crs=raster_params["crs"],
-            out_tif=out_tif,
+            out_tif=memfile.name,
             nodata_value=raster_params["nodata"],
         )
 
         with pytest.raises(ValueError) as exc_info:
-            raster.get_raster_info(out_tif)
+            raster.get_raster_info(memfile.name)
             assert exc_info.startswith(
                 "Input raster resolution is not the same in the X and Y dimensions"
             )
@@ -138,32 +130,36 @@ def test_validate_crs_units():
         )
 
 
-def test_create_vrt(test_data_dir, skip_content_check):
+def test_create_vrt(test_data_dir, skip_content_check, tmp_path):
     """
     Unit test for create_vrt: test that it creates a VRT with the expected contents
     when passed known inputs.
     """
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
+    output_directory = tmp_path
 
-        # copy the source tifs so the paths in the VRT are relative
-        # (this makes it easier to test the VRT contents)
-        src_tifs_path = test_data_dir.joinpath("vrt", "inputs")
-        copy_tifs_path = output_directory.joinpath("tifs")
-        shutil.copytree(src_tifs_path, copy_tifs_path)
+    # link (or, where symlinks are not supported, copy) the source tifs so the paths
+    # in the VRT are relative (this makes it easier to test the VRT contents)
+    src_tifs_path = test_data_dir.joinpath("vrt", "inputs")
+    copy_tifs_path = output_directory.joinpath("tifs")
+    copy_tifs_path.mkdir()
+    for src_tif in src_tifs_path.glob("*.tif"):
+        try:
+            copy_tifs_path.joinpath(src_tif.name).symlink_to(src_tif.resolve())
+        except OSError:
+            shutil.copyfile(src_tif, copy_tifs_path.joinpath(src_tif.name))
 
-        out_vrt = output_directory.joinpath("test.vrt")
-        raster.create_vrt(copy_tifs_path, out_vrt_path=out_vrt)
+    out_vrt = output_directory.joinpath("test.vrt")
+    raster.create_vrt(copy_tifs_path, out_vrt_path=out_vrt)
 
-        assert out_vrt.exists()
-        if not skip_content_check:
-            expected_vrt = test_data_dir.joinpath("vrt", "test.vrt")
-            with open(expected_vrt, "r", encoding="utf-8") as f:
-                expected_contents = f.read()
-            with open(out_vrt, "r", encoding="utf-8") as f:
-                output_contents = f.read()
-            assert expected_contents == output_contents
+    assert out_vrt.exists()
+    if not skip_content_check:
+        expected_vrt = test_data_dir.joinpath("vrt", "test.vrt")
+        with open(expected_vrt, "r", encoding="utf-8") as f:
+            expected_contents = f.read()
+        with open(out_vrt, "r", encoding="utf-8") as f:
+            output_contents = f.read()
+        assert expected_contents == output_contents
 
 
 def test_read_vrt_sources(test_data_dir):
@@ -182,48 +178,90 @@ def test_read_vrt_sources(test_data_dir):
     assert vrt_df.geometry.tolist() == [box(0, 0, 135, 135)] * 2
 
 
-def test_merge_tifs(test_data_dir):
+def test_read_vrt_sources_complex(test_data_dir, tmp_path):
     """
-    Unit test for merge_tifs: test that it produces the correct output when provided
-    known inputs.
+    Unit test for read_vrt_sources: test that sources stored as ComplexSource elements
+    (e.g., for rasters with NoData values) are parsed along with SimpleSource elements.
+    """
+    vrt_contents = test_data_dir.joinpath("vrt", "test.vrt").read_text()
+    vrt_contents = vrt_contents.replace("SimpleSource>", "ComplexSource>", 2)
+    vrt_path = tmp_path.joinpath("test_complex.vrt")
+    vrt_path.write_text(vrt_contents)
+
+    vrt_df = raster.read_vrt_sources(vrt_path=vrt_path)
+    assert vrt_df["src_file"].tolist() == [
+        "tifs/fov-pct_gid1.tif",
+        "tifs/fov-pct_gid2.tif",
+    ]
+    assert vrt_df["bounds"].tolist() == [[0, 0, 135, 135]] * 2
+
+
+def test_read_vrt_sources_cached(test_data_dir):
+    """
+    Unit test for read_vrt_sources: test that repeated reads of the same VRT return
+    equal results and that modifying a result does not affect subsequent reads.
+    """
+    vrt_path = test_data_dir.joinpath("vrt", "test.vrt")
+    vrt_df = raster.read_vrt_sources(vrt_path=vrt_path)
+    expected_src_files = vrt_df["src_file"].tolist()
+    vrt_df["src_file"] = "modified.tif"
+
+    vrt_df = raster.read_vrt_sources(vrt_path=vrt_path)
+    assert vrt_df["src_file"].tolist() == expected_src_files
+
+
+def test_merge_rasters(test_data_dir):
+    """
+    Unit test for merge_rasters: test that it produces the correct output when provided
+    known inputs, merging in-memory rasters to an in-memory output.
     """
     tif_path = test_data_dir.joinpath(
         "viewsheds", "expected_results", "fov-pct_gid1.tif"
     )
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
-
-        # copy the raster over to the temp directory
-        shutil.copyfile(tif_path, output_directory.joinpath("1.tif"))
-        # create another copy of the raster, shifted one raster extent to the right
-        with rasterio.open(tif_path, "r") as rast:
-            transform = rast.transform
-            shifted_origin = (rast.width, 0) * transform
-            shifted_transform = rasterio.transform.from_origin(
-                *shifted_origin, rast.res[0], rast.res[0]
-            )
-            raster.save_to_geotiff(
-                rast.read(1),
-                affine=shifted_transform,
-                crs=rast.crs,
-                out_tif=output_directory.joinpath("2.tif"),
-            )
+    with rasterio.open(tif_path, "r") as rast:
+        input_array = rast.read(1)
+        transform = rast.transform
+        res = rast.res[0]
+        crs = rast.crs
+        width = rast.width
+
+    # create another copy of the raster, shifted one raster extent to the right
+    shifted_origin = (width, 0) * transform
+    shifted_transform = rasterio.transform.from_origin(*shifted_origin, res, res)
+
+    with rasterio.MemoryFile() as memfile_1, rasterio.MemoryFile() as memfile_2:
+        raster.save_to_geotiff(
+            input_array, affine=transform, crs=crs, out_tif=memfile_1.name
+        )
+        raster.save_to_geotiff(
+            input_array, affine=shifted_transform, crs=crs, out_tif=memfile_2.name
+        )
+
+        with rasterio.MemoryFile() as merged_memfile:
+            with memfile_1.open() as rast_1, memfile_2.open() as rast_2:
+                raster.merge_rasters([rast_1, rast_2], merged_memfile.name)
+
+            with merged_memfile.open() as rast:
+                merged_array = rast.read(1)
 
-        merged_tif_path = output_directory.joinpath("merge.tif")
-        raster.merge_tifs(tifs_path=output_directory, out_tif_path=merged_tif_path)
+    # merged output should be equal to the input tif stacked twice side by side
+    assert merged_array.shape == (input_array.shape[0], input_array.shape[1] * 2)
+    assert np.array_equal(merged_array[:, :width], input_array)
+    assert np.array_equal(merged_array[:, width:], input_array)
 
-        assert merged_tif_path.exists()
 
-        # merged output should be equal to the input tif stacked twice side by side
-        with rasterio.open(merged_tif_path, "r") as rast:
-            merged_array = rast.read(1)
-        with rasterio.open(tif_path, "r") as rast:
-            input_array = rast.read(1)
-        expected_array = np.concatenate((input_array, input_array), axis=1)
-        assert np.array_equal(merged_array, expected_array)
+def test_merge_rasters_no_sources(tmp_path):
+    """
+    Unit test for merge_rasters to ensure it raises a ValueError when there are no
+    rasters to merge.
+    """
+    out_tif_path = tmp_path.joinpath("merged.tif")
+    with pytest.raises(ValueError, match="No source rasters to merge"):
+        raster.merge_rasters([], out_tif_path)
+    assert not out_tif_path.exists()
 
 
-def test_mosaic_block(test_data_dir):
+def test_mosaic_block(test_data_dir, tmp_path):
     """
     Unit test for mosaic block: test that it produces expected output for known inputs.
     """
@@ -237,29 +275,86 @@ def test_mosaic_block(test_data_dir):
     row = 5
     block_size = 50
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
+    output_directory = tmp_path
+
+    raster.mosaic_block(
+        vrt_df,
+        vrt_info["profile"],
+        output_directory,
+        col_offset=col,
+        row_offset=row,
+        block_size=block_size,
+    )
+    output_block = output_directory.joinpath(f"block_{row}_{col}.tif")
+    assert output_block.exists()
+
+    with rasterio.open(output_block, "r") as rast:
+        result_array = rast.read(1)
+
+    src_tif = vrt_df["src_file"].tolist()[0]
+    with rasterio.open(src_tif, "r") as rast:
+        input_array = rast.read(1, window=Window(col, row, block_size, block_size))
+    expected_array = input_array * 2
+
+    assert np.array_equal(result_array, expected_array)
+
+
+def test_find_blocks_with_sources():
+    """
+    Unit test for find_blocks_with_sources: test that it finds the same blocks as
+    checking the intersection of each block with the source raster geometries, as
+    done by mosaic_block.
+    """
+    bounds = [[0, 0, 135, 135], [200, 300, 335, 435], [135, 135, 270, 270]]
+    vrt_df = gpd.GeoDataFrame(
+        {"bounds": bounds, "geometry": [box(*b) for b in bounds]}, geometry="geometry"
+    )
+    full_profile = {"width": 500, "height": 450}
+    block_size = 50
+    row_offsets = np.arange(0, full_profile["height"] + 1, block_size)
+    col_offsets = np.arange(0, full_profile["width"] + 1, block_size)
+    offsets = np.array([(row, col) for row in row_offsets for col in col_offsets])
+
+    results = raster.find_blocks_with_sources(
+        vrt_df, full_profile, offsets, block_size
+    )
 
-        raster.mosaic_block(
-            vrt_df,
-            vrt_info["profile"],
-            output_directory,
-            col_offset=col,
-            row_offset=row,
-            block_size=block_size,
+    expected_results = []
+    for row, col in offsets:
+        block_box = box(
+            col,
+            row,
+            min(col + block_size, full_profile["width"]),
+            min(row + block_size, full_profile["height"]) + 1,
         )
-        output_block = output_directory.joinpath(f"block_{row}_{col}.tif")
-        assert output_block.exists()
+        if vrt_df.intersects(block_box).any():
+            expected_results.append((row, col))
 
-        with rasterio.open(output_block, "r") as rast:
-            result_array = rast.read(1)
+    assert 0 < len(results) < len(offsets)
+    assert results.tolist() == [list(r) for r in expected_results]
 
-        src_tif = vrt_df["src_file"].tolist()[0]
-        with rasterio.open(src_tif, "r") as rast:
-            input_array = rast.read(1)
-        expected_array = input_array[row : row + block_size, col : col + block_size] * 2
 
-        assert np.array_equal(result_array, expected_array)
+@pytest.mark.parametrize(
+    "block_size,expected_tile_size",
+    [(3600, 1200), (4096, 2048), (2064, 688), (48, 48), (16, 16)],
+)
+def test_aligned_tile_size(block_size, expected_tile_size):
+    """
+    Unit test for aligned_tile_size: test that it returns the largest valid tile size
+    that evenly divides the block size.
+    """
+    tile_size = raster.aligned_tile_size(block_size)
+    assert tile_size == expected_tile_size
+    assert block_size % tile_size == 0
+
+
+@pytest.mark.parametrize("block_size", [50, 0, -16])
+def test_aligned_tile_size_unaligned(block_size):
+    """
+    Unit test for aligned_tile_size to ensure it returns None when the block size is
+    not a positive multiple of 16.
+    """
+    assert raster.aligned_tile_size(block_size) is None
 
 
 if __name__ == "__main__":
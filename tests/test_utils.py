@@ -2,7 +2,7 @@
 """Unit tests for via_wind.utils module"""
 import pytest
 
-from via_wind.utils import verify_directory, verify_file
+from via_wind.utils import verify_directory, verify_file, find_missing_paths
 
 
 def test_verify_directory_happy(test_data_dir):
@@ -73,5 +73,31 @@ def test_verify_viewsheds_file_not_found(test_config):
         verify_file(input_file)
 
 
+def test_find_missing_paths(test_data_dir, test_config, tmp_path):
+    """
+    Unit test for find_missing_paths - test that it returns only the paths that do not
+    exist, in their input order, including paths in folders that do not exist and
+    broken symbolic links.
+    """
+    broken_link = tmp_path.joinpath("broken_link.json")
+    broken_link.symlink_to(tmp_path.joinpath("does_not_exist.json"))
+    missing_paths = [
+        test_data_dir.joinpath("missing.json").as_posix(),
+        tmp_path.joinpath("missing_folder", "missing.json"),
+        broken_link,
+    ]
+    paths = [
+        test_config.as_posix(),
+        missing_paths[0],
+        test_data_dir,
+        missing_paths[1],
+        test_data_dir.joinpath("..", test_data_dir.name),
+        missing_paths[2],
+    ]
+
+    assert find_missing_paths(paths) == missing_paths
+    assert find_missing_paths([test_config, test_data_dir]) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-s"])
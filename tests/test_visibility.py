@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 """Unit tests for via_wind.visibility module"""
-import tempfile
-from pathlib import Path
-
 import pytest
 import numpy as np
 import rasterio
 import pandas as pd
+from osgeo import gdal
 from pandas.api.types import is_numeric_dtype, is_string_dtype, is_integer_dtype
 
 from via_wind import visibility, raster
@@ -26,50 +24,65 @@ def test_calc_viewshed_shape():
     assert shape == expected_shape
 
 
-def test_run_viewshed(raster_params):
+@pytest.fixture(scope="session")
+def flat_elevation_tif(_base_raster_params):
     """
-    Test for run_viewshed() - mock a flat elevation dataset and check that
-    run_viewshed() produces the expected output - visible pixels everywhere within
-    the maximum distance.
+    Returns a tuple of the GDAL in-memory (/vsimem/) path to a mock flat elevation
+    dataset, written once per test session, the (x, y) coordinates of its center pixel,
+    and its raster parameters. Tests should treat the dataset as read-only.
     """
     max_distance_km = 2
+    raster_params = _base_raster_params.copy()
     raster_params["shape"] = visibility.calc_viewshed_shape(
         max_distance_km, raster_params["resolution"]
     )
     array = np.ones(raster_params["shape"], dtype="float32")
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        output_directory = Path(tempdir)
-        out_tif = output_directory.joinpath("test.tif")
-        raster.save_to_geotiff(
-            array,
-            affine=raster_params["affine"],
-            crs=raster_params["crs"],
-            out_tif=out_tif,
-            nodata_value=raster_params["nodata"],
-        )
+    out_tif = "/vsimem/test_run_viewshed.tif"
+    raster.save_to_geotiff(
+        array,
+        affine=raster_params["affine"],
+        crs=raster_params["crs"],
+        out_tif=out_tif,
+        nodata_value=raster_params["nodata"],
+    )
 
-        center_pixel = raster_params["shape"][0] // 2
-        center_point = rasterio.transform.xy(
-            raster_params["affine"], center_pixel, center_pixel
-        )
+    center_pixel = raster_params["shape"][0] // 2
+    center_point = rasterio.transform.xy(
+        raster_params["affine"], center_pixel, center_pixel
+    )
+
+    try:
+        yield out_tif, center_point, raster_params
+    finally:
+        gdal.Unlink(out_tif)
 
-        result = visibility.run_viewshed(
-            out_tif.as_posix(),
-            turbine_x=center_point[0],
-            turbine_y=center_point[1],
-            turbine_z=50,
-            max_distance=max_distance_km * 1000,
-            viewer_z=1.75,
-        )
-        viewshed = result.ReadAsArray()
-        assert viewshed.max() == 1
-        assert viewshed.min() == 0
-        # since the input elevation is flat, everything up to the maximum distance
-        # should be visible
-        distance, _ = calc_distance_and_direction(viewshed.shape)
-        distance *= raster_params["resolution"]
-        assert ((distance <= 2000) == viewshed).all()
+
+def test_run_viewshed(flat_elevation_tif):
+    """
+    Test for run_viewshed() - mock a flat elevation dataset and check that
+    run_viewshed() produces the expected output - visible pixels everywhere within
+    the maximum distance.
+    """
+    max_distance_km = 2
+    out_tif, center_point, raster_params = flat_elevation_tif
+
+    result = visibility.run_viewshed(
+        out_tif,
+        turbine_x=center_point[0],
+        turbine_y=center_point[1],
+        turbine_z=50,
+        max_distance=max_distance_km * 1000,
+        viewer_z=1.75,
+    )
+    viewshed = result.ReadAsArray()
+    assert viewshed.max() == 1
+    assert viewshed.min() == 0
+    # since the input elevation is flat, everything up to the maximum distance
+    # should be visible
+    distance, _ = calc_distance_and_direction(viewshed.shape)
+    distance *= raster_params["resolution"]
+    assert ((distance <= 2000) == viewshed).all()
 
 
 def test_check_columns():
@@ -102,6 +115,52 @@ def test_check_columns():
         assert exc_info == "Required column a not found in dataframe"
 
 
+def test_check_columns_many():
+    """
+    Unit test for check_columns() with many required columns - make sure it passes for
+    valid inputs, reports all missing columns together, and catches a single invalid
+    column.
+    """
+    n_cols = 60
+    df = pd.DataFrame(
+        {f"num_{i}": np.arange(0, 5, dtype="float64") for i in range(n_cols)}
+    )
+    df["str"] = ["a"] * 5
+    required_columns = {
+        f"num_{i}": (is_numeric_dtype, "must be numeric") for i in range(n_cols)
+    }
+    required_columns["str"] = (is_string_dtype, "must be string")
+    visibility.check_columns(df, required_columns)
+
+    with pytest.raises(
+        KeyError, match="Required columns num_3, num_42 not found in dataframe"
+    ):
+        visibility.check_columns(df.drop(columns=["num_3", "num_42"]), required_columns)
+
+    df["num_59"] = ["x"] * 5
+    with pytest.raises(ValueError, match="Invalid values for column num_59"):
+        visibility.check_columns(df, required_columns)
+
+    df["num_59"] = 1.0
+    df["str"] = [1, "a", "b", "c", "d"]
+    with pytest.raises(ValueError, match="Invalid values for column str"):
+        visibility.check_columns(df, required_columns)
+
+
+def test_check_columns_value_checker():
+    """
+    Unit test for check_columns() - make sure that checkers are called with the
+    column, so that checks can inspect the values as well as the dtype.
+    """
+    df = pd.DataFrame({"a": [1.0, 2.0, -3.0]})
+    required_columns = {"a": (lambda col: (col >= 0).all(), "must be non-negative")}
+    with pytest.raises(ValueError, match="Invalid values for column a"):
+        visibility.check_columns(df, required_columns)
+
+    df["a"] = df["a"].abs()
+    visibility.check_columns(df, required_columns)
+
+
 def test_get_obstruction_heights():
     """
     Unit test for get_obstruction_heights() - tests some known inputs and expected
@@ -173,21 +232,12 @@ def test_bin_distances(raster_params):
     results = visibility.bin_distances(fov_df, distance_array)
     assert np.array_equal(np.unique(results), np.array(distance_vals))
 
-    distance_vals.insert(0, distance_vals[0])
-    distance_vals.insert(-1, distance_vals[-1])
-    for i in range(1, len(distance_vals) - 1):
-        value = distance_vals[i]
-        lower = (distance_vals[i - 1] + value) / 2
-        upper = (distance_vals[i + 1] + value) / 2
-        if i == 1:
-            expected_result = np.less_equal(distance_array, upper)
-        elif i == (len(distance_vals) - 2):
-            expected_result = np.greater(distance_array, lower)
-        else:
-            expected_result = np.greater(distance_array, lower) & np.less_equal(
-                distance_array, upper
-            )
-        assert np.array_equal(expected_result, results == value)
+    # each distance value is assigned the pixels between the midpoints to its
+    # neighboring values, with pixels on a midpoint assigned to the lower value
+    distance_vals = np.asarray(distance_vals)
+    edges = (distance_vals[:-1] + distance_vals[1:]) / 2
+    expected_result = distance_vals[np.digitize(distance_array, edges, right=True)]
+    assert np.array_equal(expected_result, results)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 """Helper functions for tests"""
+from functools import lru_cache
+import fnmatch
+import io
+import os
+from pathlib import Path, PurePath
+import re
 
-import imagehash
 from PIL import Image
 import numpy as np
 import pandas as pd
+import rasterio
 from pandas.testing import assert_frame_equal
 
 
@@ -27,24 +33,155 @@ def check_files_match(pattern, dir_1_path, dir_2_path):
     Returns
     -------
     tuple
-        Returns a tuple with two elements: the first element is a boolean indicating
+        Returns a tuple with three elements: the first element is a boolean indicating
         whether the files in the two folders match and the second is a list of
         differences between the two folders (if applicable). If the files match, the
-        list will be empty.
+        list will be empty. The third element is the list of paths matching the pattern
+        in the first directory, relative to that directory, so callers can reuse it
+        without walking the directory again.
     """
 
-    output_files = [f.relative_to(dir_1_path) for f in dir_1_path.rglob(pattern)]
-    expected_output_files = [
-        f.relative_to(dir_2_path) for f in dir_2_path.rglob(pattern)
-    ]
+    regex = re.compile(fnmatch.translate(pattern))
+    output_files = sorted(_iter_relative_paths(dir_1_path, regex))
+    expected_output_files = sorted(_iter_relative_paths(dir_2_path, regex))
 
-    difference = list(
-        set(output_files).symmetric_difference(set(expected_output_files))
-    )
+    # walk the two sorted lists together to find the paths only present in one
+    difference = []
+    i = j = 0
+    while i < len(output_files) and j < len(expected_output_files):
+        if output_files[i] == expected_output_files[j]:
+            i += 1
+            j += 1
+        elif output_files[i] < expected_output_files[j]:
+            difference.append(output_files[i])
+            i += 1
+        else:
+            difference.append(expected_output_files[j])
+            j += 1
+    difference.extend(output_files[i:])
+    difference.extend(expected_output_files[j:])
+
+    output_files = [PurePath(f) for f in output_files]
     if len(difference) == 0:
-        return True, []
+        return True, [], output_files
+
+    return False, [PurePath(f) for f in difference], output_files
+
+
+def _iter_relative_paths(root, regex):
+    """
+    Recursively walk a directory, yielding the paths (relative to the directory, as
+    strings) of all entries whose names match the specified regular expression. This
+    is equivalent to [p.relative_to(root) for p in root.rglob(pattern)], but uses
+    os.scandir, which avoids a stat call and a Path object for every entry.
+
+    Parameters
+    ----------
+    root : [str, pathlib.Path]
+        Directory to walk.
+    regex : re.Pattern
+        Compiled regular expression used to match entry names (e.g., from
+        fnmatch.translate()).
+
+    Yields
+    ------
+    str
+        Relative path of each matching entry.
+    """
+    stack = [("", root)]
+    while stack:
+        rel_dir, cur_dir = stack.pop()
+        with os.scandir(cur_dir) as entries:
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                if regex.match(entry.name):
+                    yield rel_path
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel_path + "/", entry.path))
+
+
+@lru_cache(maxsize=8)
+def _dct_basis(hash_size, img_size):
+    """
+    Returns the first hash_size rows of the (unnormalized, type II) DCT basis matrix
+    for inputs of length img_size, matching scipy.fftpack.dct's default scaling.
+    """
+    k = np.arange(hash_size)[:, None]
+    n = np.arange(img_size)[None, :]
+    basis = 2 * np.cos(np.pi * k * (2 * n + 1) / (2 * img_size))
+    basis.setflags(write=False)
+
+    return basis
+
+
+@lru_cache(maxsize=64)
+def _load_gray(image_path, mtime_ns):
+    """
+    Decode an image to a read-only, 8-bit grayscale array, memoized on the resolved
+    path and modification time so that each image is only decoded once, regardless
+    of how many hash sizes it is compared at.
+    """
+    with Image.open(image_path) as image:
+        gray = np.asarray(image.convert("L"))
+    gray.setflags(write=False)
+
+    return gray
+
+
+def load_gray_cached(image_path):
+    """
+    Load an image as a grayscale array, caching the decoded result.
+
+    Parameters
+    ----------
+    image_path : [str, pathlib.Path]
+        Path to image.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only, two dimensional uint8 array of grayscale pixel values.
+    """
+    image_path = Path(image_path).resolve()
+
+    return _load_gray(image_path, image_path.stat().st_mtime_ns)
+
+
+def _phash_bits(gray, hash_size, highfreq_factor=4):
+    """
+    Compute the perceptual hash of an image, packed into a single integer with one
+    bit per hash element so that hashes can be compared with a single XOR/popcount.
+    Follows the same algorithm as imagehash.phash, but only computes the
+    low-frequency block of the DCT that is used for the hash, as two matrix products.
+
+    Parameters
+    ----------
+    gray : numpy.ndarray
+        Two dimensional uint8 array of grayscale pixel values of the image to hash.
+    hash_size : int
+        Size of the image hash.
+    highfreq_factor : int, optional
+        Ratio of the size of the resized image used for the DCT to the hash size, by
+        default 4.
+
+    Returns
+    -------
+    int
+        Packed perceptual hash bits.
+    """
+    img_size = hash_size * highfreq_factor
+    image = Image.fromarray(gray).resize(
+        (img_size, img_size), Image.Resampling.LANCZOS
+    )
+    pixels = np.asarray(image, dtype="float64")
 
-    return False, difference
+    basis = _dct_basis(hash_size, img_size)
+    # round off floating point noise from the matrix products so that (near) zero
+    # coefficients compare consistently against the median
+    dct_low_freq = np.round(basis @ pixels @ basis.T, 6)
+    bits = (dct_low_freq > np.median(dct_low_freq)).ravel()
+
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
 
 
 def compare_images_approx(image_1_path, image_2_path, hash_size=12, max_diff_pct=0.25):
@@ -76,12 +213,13 @@ def compare_images_approx(image_1_path, image_2_path, hash_size=12, max_diff_pct
         images.
     """
 
-    expected_hash = imagehash.phash(Image.open(image_1_path), hash_size=hash_size)
-    out_hash = imagehash.phash(Image.open(image_2_path), hash_size=hash_size)
+    expected_hash = _phash_bits(load_gray_cached(image_1_path), hash_size=hash_size)
+    out_hash = _phash_bits(load_gray_cached(image_2_path), hash_size=hash_size)
 
     max_diff_bits = int(np.ceil(hash_size * max_diff_pct))
 
-    diff = expected_hash - out_hash
+    # hamming distance between the two hashes
+    diff = (expected_hash ^ out_hash).bit_count()
     matches = diff <= max_diff_bits
     pct_diff = float(diff) / hash_size
 
@@ -92,7 +230,8 @@ def compare_csv_data(csv_1, csv_2, **kwargs):
     """
     Compares the contents of two CSVs to make sure they match. Uses
     pandas.testing.assert_frame_equal under the hood; **kwargs will be passed
-    to this function.
+    to this function. CSVs with byte-identical contents are considered to match
+    without being parsed.
 
     Parameters
     ----------
@@ -107,7 +246,45 @@ def compare_csv_data(csv_1, csv_2, **kwargs):
         An AssertionError will be raised if the contents of the two CSVs do not match.
     """
 
-    df1 = pd.read_csv(csv_1)
-    df2 = pd.read_csv(csv_2)
+    csv_1_bytes = Path(csv_1).read_bytes()
+    csv_2_bytes = Path(csv_2).read_bytes()
+    if csv_1_bytes == csv_2_bytes:
+        return
+
+    df1 = pd.read_csv(io.BytesIO(csv_1_bytes))
+    df2 = pd.read_csv(io.BytesIO(csv_2_bytes))
 
     assert_frame_equal(df1, df2, **kwargs)
+
+
+@lru_cache(maxsize=64)
+def _read_tif(tif_path):
+    """
+    Read all bands of a GeoTiff, memoized on the resolved path. Returned arrays are
+    made read-only so that cached results cannot be modified in place by callers.
+    """
+    with rasterio.open(tif_path, "r") as rast:
+        array = rast.read()
+    array.setflags(write=False)
+
+    return array
+
+
+def read_tif_cached(tif_path):
+    """
+    Read the contents of a GeoTiff, caching the result so that repeated reads of the
+    same file (e.g., expected results shared by several tests) only hit the disk once.
+    Should only be used for static files that will not change during the test session.
+
+    Parameters
+    ----------
+    tif_path : [str, pathlib.Path]
+        Path to GeoTiff.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only, three dimensional array with the contents of all bands of the
+        GeoTiff.
+    """
+    return _read_tif(Path(tif_path).resolve())
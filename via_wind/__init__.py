@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """via-wind"""
+from functools import lru_cache
+import mmap
 from pathlib import Path
+import pickle
 
 from via_wind.version import __version__
 
@@ -14,3 +17,20 @@ DATA_DIR = PACKAGE_DIR.joinpath("data")
 CALIBRATION_MODEL = DATA_DIR.joinpath(
     "models", "ordered_probit_vis_impact_cat_by_log_fov_pct_20240307T0947.pkl"
 )
+
+
+@lru_cache(maxsize=1)
+def load_calibration_model():
+    """
+    Load the statsmodels ordinal regression model used to calibrate FOV percent values
+    to visual impact ratings. The model is only deserialized on the first call;
+    subsequent calls return the same (shared) model object.
+
+    Returns
+    -------
+    statsmodels.miscmodels.ordinal_model.OrderedResultsWrapper
+        Calibration model.
+    """
+    with open(CALIBRATION_MODEL, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return pickle.loads(mm)
@@ -3,11 +3,12 @@
 blender module
 """
 from pathlib import Path
+from functools import lru_cache
+import itertools
 import warnings
 import math
 
 import bpy
-import numpy as np
 from via_wind.log import CSilencer
 
 
@@ -27,6 +28,24 @@ WHITE_RGB = (1, 1, 1)
 WHITE_RGBA = (1, 1, 1, 1)
 RED_RGBA = (1, 0, 0, 1)
 VALID_ROTATIONS = {"FRONT": (0, 90, 0), "SIDE": (90, 90, 0), "DIAGONAL": (45, 90, 0)}
+ROTATION_NAMES = {angles: name for name, angles in VALID_ROTATIONS.items()}
+CAMERA_ROTATION = (90, 0, -90)
+INV_SQRT_2 = 1 / math.sqrt(2)
+# names of the surface materials created for each (name, color), see
+# get_surface_material
+SURFACE_MATERIALS = {}
+# radians for the fixed rotations, precomputed so they aren't converted on every use
+ROTATIONS_RAD = {
+    rotation: tuple(math.radians(angle) for angle in rotation)
+    for rotation in (*VALID_ROTATIONS.values(), OBSTRUCTION_ROTATION, CAMERA_ROTATION)
+}
+
+# geometry matching the default bpy.ops.mesh.primitive_plane_add(): a 2 x 2 square
+# centered on the origin, facing up the Z axis
+PLANE_GEOMETRY = (
+    ((-1.0, -1.0, 0.0), (1.0, -1.0, 0.0), (1.0, 1.0, 0.0), (-1.0, 1.0, 0.0)),
+    ((0, 1, 2, 3),),
+)
 
 
 def configure_scene(config):
@@ -50,8 +69,18 @@ def configure_scene(config):
     scene.view_settings.view_transform = "Standard"
     scene.render.resolution_x = config.camera.output_resolution_width
     scene.render.resolution_y = config.camera.output_resolution_height
-    # output to black and white image
+    # output to 8-bit black and white image
     scene.render.image_settings.color_mode = "BW"
+    scene.render.image_settings.color_depth = "8"
+    # render with Eevee and turn off the effects and post-processing that have no
+    # impact on matte, shadowless silouettes
+    scene.render.engine = "BLENDER_EEVEE"
+    scene.eevee.use_bloom = False
+    scene.eevee.use_ssr = False
+    scene.eevee.use_gtao = False
+    scene.eevee.use_volumetric_lights = False
+    scene.render.use_compositing = False
+    scene.render.use_sequencer = False
 
     return scene
 
@@ -110,10 +139,52 @@ def create_sun(config):
     return sun
 
 
+def get_surface_material(name, color):
+    """
+    Get a matte (no reflection) surface material with the specified name and color.
+    Materials are cached by name and color: if a matching material was already
+    created and still exists in the current Blender session, it is reused rather than
+    creating a duplicate material.
+
+    Parameters
+    ----------
+    name : str
+        Name of the material.
+    color : tuple
+        Four element tuple specifying Red, Green, Blue, and Alpha (RGBA) color to be
+        used for the material.
+
+    Returns
+    -------
+    bpy.types.Material
+        Returns Blender Material.
+    """
+    color = tuple(color)
+    # materials are looked up by name rather than cached directly, because cached
+    # materials would be invalidated when the Blender session is reset
+    material = bpy.data.materials.get(SURFACE_MATERIALS.get((name, color), ""))
+    if material is not None and all(
+        math.isclose(value, expected, abs_tol=1e-6)
+        for value, expected in zip(material.diffuse_color, color)
+    ):
+        return material
+
+    material = bpy.data.materials.new(name=name)
+    material.specular_intensity = 0
+    material.roughness = 0
+    material.metallic = 0
+    material.diffuse_color = color
+    # blender may have given the material a different name to keep names unique
+    SURFACE_MATERIALS[(name, color)] = material.name
+
+    return material
+
+
 def create_turbine_surface_material(color=BLACK_RGBA):
     """
     Create the surface material typically used for rendering of turbine tower and rotor
-    area. Material is matte (no reflection) and the specified color.
+    area. Material is matte (no reflection) and the specified color. An existing
+    material with the same color is reused (see get_surface_material).
 
     Parameters
     ----------
@@ -126,20 +197,15 @@ def create_turbine_surface_material(color=BLACK_RGBA):
     bpy.types.Material
         Returns Blender Material to be used for turbine rendering.
     """
-    turb_mat = bpy.data.materials.new(name="TurbineMaterial")
-    turb_mat.specular_intensity = 0
-    turb_mat.roughness = 0
-    turb_mat.metallic = 0
-    turb_mat.diffuse_color = color
-
-    return turb_mat
+    return get_surface_material("TurbineMaterial", color)
 
 
 def create_obstruction_surface_material(color=WHITE_RGBA):
     """
     Create the surface material typically used for rendering of the obstruction that
     is placed in front of the turbine. Material is matte (no reflection) and the
-    specified color.
+    specified color. An existing material with the same color is reused (see
+    get_surface_material).
 
     Parameters
     ----------
@@ -152,13 +218,106 @@ def create_obstruction_surface_material(color=WHITE_RGBA):
     bpy.types.Material
         Returns Blender Material to be used for obstruction rendering.
     """
-    obs_mat = bpy.data.materials.new(name="ObstructionMaterial")
-    obs_mat.specular_intensity = 0
-    obs_mat.roughness = 0
-    obs_mat.metallic = 0
-    obs_mat.diffuse_color = color
+    return get_surface_material("ObstructionMaterial", color)
+
+
+def rotation_to_radians(rotation):
+    """
+    Convert a three-element rotation from degrees to radians. Rotations in
+    ROTATIONS_RAD are looked up rather than converted.
+
+    Parameters
+    ----------
+    rotation : tuple
+        Three element tuple specifying the rotations around the X, Y, and Z axes in
+        units of degrees.
+
+    Returns
+    -------
+    tuple
+        Three element tuple specifying the rotations around the X, Y, and Z axes in
+        units of radians.
+    """
+    rotation = tuple(rotation)
+    rotation_rad = ROTATIONS_RAD.get(rotation)
+    if rotation_rad is None:
+        rotation_rad = tuple(math.radians(angle) for angle in rotation)
+
+    return rotation_rad
+
+
+@lru_cache(maxsize=8)
+def cylinder_geometry(n_vertices):
+    """
+    Build the vertices and faces of a cylinder matching the default geometry of
+    bpy.ops.mesh.primitive_cylinder_add(): a radius of 1 and a depth of 2, centered on
+    the origin, with the round ends capped by n-gons and oriented perpendicular to the
+    Z axis. Results are cached, so the geometry for each number of vertices is only
+    built once.
 
-    return obs_mat
+    Parameters
+    ----------
+    n_vertices : int
+        Number of vertices around each of the round ends of the cylinder.
+
+    Returns
+    -------
+    tuple
+        Returns a tuple of two tuples: the first contains the (x, y, z) coordinates of
+        each vertex; the second contains the vertex indices of each face.
+    """
+    ring = tuple(
+        (math.sin(2 * math.pi * i / n_vertices), math.cos(2 * math.pi * i / n_vertices))
+        for i in range(n_vertices)
+    )
+    # bottom ring, followed by top ring
+    vertices = tuple((x, y, -1.0) for x, y in ring) + tuple(
+        (x, y, 1.0) for x, y in ring
+    )
+
+    # side quads, wound so that the normals face outwards
+    faces = tuple(
+        (i, n_vertices + i, n_vertices + (i + 1) % n_vertices, (i + 1) % n_vertices)
+        for i in range(n_vertices)
+    )
+    # bottom and top caps
+    faces += (
+        tuple(range(n_vertices)),
+        tuple(range(2 * n_vertices - 1, n_vertices - 1, -1)),
+    )
+
+    return vertices, faces
+
+
+def create_mesh_object(name, vertices, faces):
+    """
+    Create a Blender "mesh" Object from the input geometry and link it to the active
+    collection. Constructs the mesh data directly, avoiding the overhead of the
+    bpy.ops.mesh.primitive_*_add() operators (context evaluation, undo steps, and
+    scene updates).
+
+    Parameters
+    ----------
+    name : str
+        Name for the mesh and object.
+    vertices : tuple
+        Sequence of (x, y, z) vertex coordinates.
+    faces : tuple
+        Sequence of faces, each a sequence of vertex indices.
+
+    Returns
+    -------
+    bpy_types.Object
+        Returns Blender "mesh" Object.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], faces)
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+
+    return obj
 
 
 def create_rotors(
@@ -206,11 +365,9 @@ def create_rotors(
     """
     rotor_radius = config.turbine.rotor_diameter_m * 0.5
     blade_radius = config.turbine.blade_chord_m * 0.5
-    bpy.ops.mesh.primitive_cylinder_add(vertices=n_vertices)
-    rotors = bpy.context.active_object
-    rotors.name = "Rotors"
+    rotors = create_mesh_object("Rotors", *cylinder_geometry(n_vertices))
     rotors.location = (distance_from_camera_m, 0, config.turbine.hub_height_m)
-    rotors.rotation_euler = np.radians(rotation)
+    rotors.rotation_euler = rotation_to_radians(rotation)
     rotors.scale = (rotor_radius, rotor_radius, blade_radius)
     # add surface material
     rotors.data.materials.append(surface_material)
@@ -253,9 +410,7 @@ def create_tower(
     """
     tower_radius = config.turbine.tower_diameter_m / 2.0
     tower_offset = 0.5 * config.turbine.hub_height_m
-    bpy.ops.mesh.primitive_cylinder_add(vertices=n_vertices)
-    tower = bpy.context.active_object
-    tower.name = "Tower"
+    tower = create_mesh_object("Tower", *cylinder_geometry(n_vertices))
     tower.location = (distance_from_camera_m, 0, tower_offset)
     tower.scale = (tower_radius, tower_radius, tower_offset)
     # add surface material
@@ -309,9 +464,7 @@ def create_obstruction(
         visual obstruction shielding part of the turbine from view.
     """
     obstruction_vertical_offset = height_m / 2.0
-    bpy.ops.mesh.primitive_plane_add()
-    obstruction = bpy.context.active_object
-    obstruction.name = "Obstruction"
+    obstruction = create_mesh_object("Obstruction", *PLANE_GEOMETRY)
     obstruction.location = (
         distance_from_camera_m,
         0,
@@ -322,7 +475,7 @@ def create_obstruction(
         width_m * 0.5,
         depth_m * 0.5,
     )
-    obstruction.rotation_euler = np.radians(rotation)
+    obstruction.rotation_euler = rotation_to_radians(rotation)
     # add surface material
     obstruction.data.materials.append(surface_material)
 
@@ -368,7 +521,7 @@ def create_camera(config):
     # create and position the camera object
     camera = bpy.data.objects.new("Camera", camera_data)
     camera.location = (0, 0, config.camera.height_m)
-    camera.rotation_euler = np.radians([90, 0, -90])
+    camera.rotation_euler = ROTATIONS_RAD[CAMERA_ROTATION]
 
     return camera
 
@@ -390,6 +543,54 @@ def set_camera_tracking(camera, track_to_obj):
     constraint.up_axis = "UP_Y"
 
 
+def build_scene(config):
+    """
+    Set up the Blender scene and all of the objects in it that are needed to render
+    silouettes: the world, sun, camera, turbine rotors and tower, and obstruction.
+    All settings that are invariant across the rendered images are applied here, so
+    this only needs to be called once per config; subsequent images can be rendered
+    by repositioning the turbine and obstruction with position_turbine and
+    position_obstruction.
+
+    Parameters
+    ----------
+    config : via_wind.config.Config
+        Configuration namespace. Must contain "camera" and "turbine" properties with
+        multiple subproperties.
+
+    Returns
+    -------
+    tuple
+        Returns a tuple of the Blender scene, and the Blender "mesh" Objects
+        representing the turbine rotors, turbine tower, and obstruction.
+    """
+    scene = configure_scene(config)
+    # create world and attach to scene
+    scene.world = create_world()
+    # create sun and add to scene
+    scene.collection.objects.link(create_sun(config))
+
+    # create surface materials
+    turb_mat = create_turbine_surface_material()
+    obs_mat = create_obstruction_surface_material()
+
+    # create turbine components
+    # Note: these are automatically added to the scene
+    rotors = create_rotors(config, surface_material=turb_mat)
+    tower = create_tower(config, surface_material=turb_mat)
+
+    # create obstruction
+    obstruction = create_obstruction(surface_material=obs_mat)
+
+    # set up camera
+    camera = create_camera(config)
+    set_camera_tracking(camera, track_to_obj=rotors)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+
+    return scene, rotors, tower, obstruction
+
+
 def validate_rotation(rotation):
     """
     Checks that the input rotation is either one of the names of the well-known
@@ -416,11 +617,18 @@ def validate_rotation(rotation):
     Raises
     ------
     ValueError
-        A ValueError will be raised if the input tuple does not have 3 elements.
+        A ValueError will be raised if the input is a string that is not one of the
+        names of the well-known rotations, or if the input tuple does not have 3
+        elements.
     """
-    rotation_angles = VALID_ROTATIONS.get(rotation, tuple(rotation))
+    # named rotations are the common case when rendering, so look these up directly
+    # without building and checking a new tuple
+    if isinstance(rotation, str):
+        rotation_angles = VALID_ROTATIONS.get(rotation)
+    else:
+        rotation_angles = tuple(rotation)
 
-    if not len(rotation_angles) == 3:
+    if rotation_angles is None or not len(rotation_angles) == 3:
         raise ValueError(
             "Invalid input for rotation. Must either be a list/tuple with three "
             "numeric elements or one of the valid named rotations: "
@@ -430,7 +638,63 @@ def validate_rotation(rotation):
     return rotation_angles
 
 
-def position_turbine(rotors, tower, config, distance_to_camera_m, rotation):
+def compute_rotation_offsets(config):
+    """
+    Compute the horizontal offsets of the rotors and the obstruction, relative to the
+    position of the tower, for each of the well-known rotations. These only depend on
+    the turbine dimensions, so they can be computed once and reused for every image
+    rendered with the same config.
+
+    Parameters
+    ----------
+    config : via_wind.config.Config
+        Configuration namespace. Must contain "turbine" property with multiple
+        subproperties.
+
+    Returns
+    -------
+    dict
+        Dictionary keyed by the name of each well-known rotation (e.g., "FRONT",
+        "SIDE", "DIAGONAL"). Values are three-element tuples with the offset of the
+        rotors along the X axis (i.e., towards or away from the camera), the offset of
+        the rotors along the Y axis (i.e., left or right from the centerline of the
+        field of view), and the offset of the obstruction along the X axis.
+    """
+    rotor_overhang_m = config.turbine.rotor_overhang_m
+    rotor_radius_m = config.turbine.rotor_diameter_m * 0.5
+    # for the diagonal rotation, the turbine is turned at a 45 degree angle, so the
+    # offsets are the sides of 45-45-90 right triangles (i.e., hypotenuse / sqrt(2))
+    diagonal_overhang_m = rotor_overhang_m * INV_SQRT_2
+
+    offsets = {
+        # the rotor is moved closer to the camera by the "rotor_overhang_m" and
+        # centered on the centerline of the field of view (i.e., direction the camera
+        # is looking). the obstruction is moved forward 1 m in front of the blades
+        "FRONT": (
+            -rotor_overhang_m,
+            0,
+            -rotor_overhang_m - config.turbine.blade_chord_m * 0.5 - 1,
+        ),
+        # the rotor is the same distance from the camera as the tower and offset
+        # from the centerline to the left by the "rotor_overhang_m". the obstruction is
+        # moved forward the rotor radius plus 1 m
+        "SIDE": (0, rotor_overhang_m, -rotor_radius_m - 1),
+        # the rotor is moved forward and to the left by the overhang offset distance.
+        # the obstruction is moved forward based on the rotor radius and the overhang
+        # offset distance plus 1 m
+        "DIAGONAL": (
+            -diagonal_overhang_m,
+            diagonal_overhang_m,
+            -(rotor_radius_m * INV_SQRT_2) - diagonal_overhang_m - 1,
+        ),
+    }
+
+    return offsets
+
+
+def position_turbine(
+    rotors, tower, config, distance_to_camera_m, rotation, offsets=None
+):
     """
     (Re)position the turbine, including both the rotors and the tower, to the specified
     distance from the camera and rotation angle.
@@ -452,51 +716,45 @@ def position_turbine(rotors, tower, config, distance_to_camera_m, rotation):
         Three element tuple defining rotation of the turbine relative to the camera
         position. The elements of this tuple should be numeric (i.e., float or int)
         and in units of degrees.
+    offsets : [dict, None], optional
+        Offsets for the well-known rotations, as returned by compute_rotation_offsets.
+        By default None, which computes the offsets from the config. When positioning
+        the turbine repeatedly, compute these once and pass them in.
     """
     rotation_angles = validate_rotation(rotation)
 
     # set the rotation/orientation of the rotors
-    rotors.rotation_euler = np.radians(rotation_angles)
+    rotors.rotation_euler = rotation_to_radians(rotation_angles)
 
     # set the position of the tower
     tower.location.x = distance_to_camera_m
 
     # adjust the position of the rotors
-    if rotation == "FRONT" or rotation_angles == VALID_ROTATIONS["FRONT"]:
-        # move the rotor closer to the camera by the distance specified in the
-        # config for the "rotor_overhang_m"
-        rotors.location.x = distance_to_camera_m - config.turbine.rotor_overhang_m
-        # center the rotor on centerline of the field of view (i.e., direction the
-        # camera is looking)
-        rotors.location.y = 0
-    elif rotation == "SIDE" or rotation_angles == VALID_ROTATIONS["SIDE"]:
-        # set the rotor distance so it is the same as the camera
-        rotors.location.x = distance_to_camera_m
-        # offset the turbine from the FOV centerline to the left by the distance
-        # specified in the config for the "rotor_overhang_m"
-        rotors.location.y = config.turbine.rotor_overhang_m
-    elif rotation == "DIAGONAL" or rotation_angles == VALID_ROTATIONS["DIAGONAL"]:
-        # turbine is turned at a 45 degree angle and it is "rotor_overhang_m"
-        # this is a 45-45-90 right triangle, so the x and y offsets are equal to the
-        # hypotenuse / sqrt(2) away
-        off_dist = config.turbine.rotor_overhang_m / math.sqrt(2)
-        # move forward by the offset distance
-        rotors.location.x = distance_to_camera_m - off_dist
-        # move off the centerline to the left by the offset distance
-        rotors.location.y = off_dist
-    else:
+    rotation_name = ROTATION_NAMES.get(rotation_angles)
+    if rotation_name is None:
         # determining the rotor offset would require some trigonometry that hasn't
         # been implemented, so position the rotors like it is centered on the tower
         warnings.warn(
             "Input angle is not well-known. Rotor will be rotated but will not be "
             "offset from tower."
         )
-        rotors.location.x = distance_to_camera_m
-        rotors.location.y = 0
+        rotor_x_offset, rotor_y_offset = 0, 0
+    else:
+        if offsets is None:
+            offsets = compute_rotation_offsets(config)
+        rotor_x_offset, rotor_y_offset, _ = offsets[rotation_name]
+
+    # assign the horizontal position in one update rather than one per axis
+    rotors.location[0:2] = (distance_to_camera_m + rotor_x_offset, rotor_y_offset)
 
 
 def position_obstruction(
-    obstruction, config, height_m, turb_distance_to_camera_m, turb_rotation
+    obstruction,
+    config,
+    height_m,
+    turb_distance_to_camera_m,
+    turb_rotation,
+    offsets=None,
 ):
     """
     (Re)position the obstruction to stay between the turbine and the camera based on the
@@ -519,52 +777,36 @@ def position_obstruction(
         Three element tuple defining rotation of the turbine relative to the camera
         position. The elements of this tuple should be numeric (i.e., float or int)
         and in units of degrees.
+    offsets : [dict, None], optional
+        Offsets for the well-known rotations, as returned by compute_rotation_offsets.
+        By default None, which computes the offsets from the config. When positioning
+        the obstruction repeatedly, compute these once and pass them in.
     """
-    # set the height and vertical position of the obstruction
-    obstruction.location.z = height_m * 0.5
+    # set the height of the obstruction
     obstruction.scale.x = height_m * 0.5
 
+    if offsets is None:
+        offsets = compute_rotation_offsets(config)
+
     # adjust the distance to make sure it is in front of the turbine
     turb_rotation_angles = validate_rotation(turb_rotation)
-    if turb_rotation == "FRONT" or turb_rotation_angles == VALID_ROTATIONS["FRONT"]:
-        # turbine is facing front so move obstruction forward 1 m in front of the blades
-        obstruction_distance = (
-            turb_distance_to_camera_m
-            - config.turbine.rotor_overhang_m
-            - config.turbine.blade_chord_m * 0.5
-            - 1
-        )
-    elif turb_rotation == "SIDE" or turb_rotation_angles == VALID_ROTATIONS["SIDE"]:
-        # turbine is sideways so move obstruction forward the rotor radius plus 1m
-        obstruction_distance = (
-            turb_distance_to_camera_m - config.turbine.rotor_diameter_m * 0.5 - 1
-        )
-    elif (
-        turb_rotation == "DIAGONAL"
-        or turb_rotation_angles == VALID_ROTATIONS["DIAGONAL"]
-    ):
-        # turbine is at a 45 degree angle so move obstruction forward based on
-        # rotor radius and offset from tower accounting for trig of 45-45-90 triangle
-        # plus 1 m
-        obstruction_distance = (
-            turb_distance_to_camera_m
-            - (config.turbine.rotor_diameter_m * 0.5 / math.sqrt(2))
-            - (config.turbine.rotor_overhang_m / math.sqrt(2))
-            - 1
-        )
-    else:
+    rotation_name = ROTATION_NAMES.get(turb_rotation_angles)
+    if rotation_name is None:
         # determining the obstruction offset would require some trigonometry that hasn't
         # been implemented, so position the obstruction as if the rotors are sideways
         warnings.warn(
             "Input angle is not well-known. Obstruction will be placed as if the "
             "rotors are sideways to ensure the turbine is obstructed."
         )
-        # turbine is sideways so move obstruction forward the rotor radius plus 1m
-        obstruction_distance = (
-            turb_distance_to_camera_m - config.turbine.rotor_diameter_m * 0.5 - 1
-        )
+        rotation_name = "SIDE"
 
-    obstruction.location.x = obstruction_distance
+    # set the distance and vertical position of the obstruction in one update rather
+    # than one per axis
+    obstruction.location = (
+        turb_distance_to_camera_m + offsets[rotation_name][2],
+        obstruction.location.y,
+        height_m * 0.5,
+    )
 
 
 def render_image(scene, out_image, verbose=False):
@@ -592,3 +834,120 @@ def render_image(scene, out_image, verbose=False):
     else:
         with CSilencer():
             bpy.ops.render.render(write_still=True)
+
+
+def get_frames(config):
+    """
+    Get every combination of rotation, distance to camera, and obstruction height in
+    the config, in the order they are rendered by batch_render.
+
+    Parameters
+    ----------
+    config : via_wind.config.Config
+        Configuration namespace. Must contain "turbine" property with multiple
+        subproperties.
+
+    Returns
+    -------
+    list
+        List of (rotation, distance to camera, obstruction height) tuples.
+    """
+    # itertools.product (rather than numpy broadcasting) keeps the config values as-is,
+    # so output file names are unchanged (e.g., 150 rather than 150.0). obstruction
+    # height varies fastest, since it is the only parameter that doesn't move the
+    # turbine
+    return list(
+        itertools.product(
+            config.turbine.rotations,
+            config.turbine.distances_to_camera_m,
+            config.turbine.obstruction_heights,
+        )
+    )
+
+
+def batch_render(config, output_path, progress_callback=None, frames=None):
+    """
+    Render silouettes for every combination of obstruction height, distance to camera,
+    and rotation in the config. The scene is built once, all within the current
+    Blender session. The obstruction is repositioned for each rendered image, while
+    the turbine is only repositioned when its distance or rotation changes. Output
+    images are saved as png files named like
+    "d{distance}m-r{rotation}-o{obstruction_height}m.png".
+
+    Parameters
+    ----------
+    config : via_wind.config.Config
+        Configuration namespace. Must contain "camera" and "turbine" properties with
+        multiple subproperties.
+    output_path : pathlib.Path
+        Path to the directory in which output images will be saved.
+    progress_callback : [callable, None], optional
+        If specified, this function will be called with the number of completed images
+        (i.e., 1) after each image is rendered, e.g., to update a progress bar. By
+        default None.
+    frames : [list, None], optional
+        List of (rotation, distance to camera, obstruction height) tuples to render,
+        e.g., a subset of the frames returned by get_frames(). By default None, which
+        renders all of the combinations in the config.
+
+    Returns
+    -------
+    list
+        List of file paths (as strings) for the rendered images.
+    """
+    # this is a non-interactive session, so don't spend time or memory on undo steps
+    # or autosaves
+    bpy.context.preferences.edit.use_global_undo = False
+    bpy.context.preferences.filepaths.use_auto_save_temporary_files = False
+
+    scene, rotors, tower, obstruction = build_scene(config)
+
+    # turbine and obstruction offsets only depend on the config, so compute them once
+    offsets = compute_rotation_offsets(config)
+
+    # output image paths are formatted as strings from the output directory path, so
+    # that each rendered image doesn't need to build and convert a new pathlib.Path
+    output_dir = output_path.as_posix()
+
+    out_images = []
+    # iterate over all combinations of the frame parameters in a single flat loop
+    if frames is None:
+        frames = get_frames(config)
+    turbine_position = None
+    # silence messages from the Blender renderer once for the whole batch, rather than
+    # separately for every rendered image
+    with CSilencer():
+        for rotation, distance, obstruction_height in frames:
+            # reposition the turbine, if it has moved since the last image
+            if (distance, rotation) != turbine_position:
+                position_turbine(
+                    rotors,
+                    tower,
+                    config,
+                    distance_to_camera_m=distance,
+                    rotation=rotation,
+                    offsets=offsets,
+                )
+                turbine_position = (distance, rotation)
+
+            # reposition the obstruction
+            position_obstruction(
+                obstruction,
+                config,
+                height_m=obstruction_height,
+                turb_distance_to_camera_m=distance,
+                turb_rotation=rotation,
+                offsets=offsets,
+            )
+
+            # render scene to output image
+            out_image = (
+                f"{output_dir}/d{distance}m-r{rotation}-o{obstruction_height}m.png"
+            )
+            render_image(scene, out_image)
+            out_images.append(out_image)
+
+            if progress_callback is not None:
+                progress_callback(1)
+
+    return out_images
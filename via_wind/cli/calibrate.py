@@ -3,24 +3,43 @@
 calibrate module - sets up CLI for calibrate command using nrel-gaps
 """
 import logging
-from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
-import statsmodels.api as sm
 import rasterio
 import tqdm
 from gaps.cli import as_click_command, CLICommandFromFunction
 import numpy as np
+from scipy import special
 
-from via_wind import __version__, CALIBRATION_MODEL
-from via_wind.log import init_logger, remove_streamhandlers
+from via_wind import __version__, load_calibration_model
+from via_wind.log import init_logger, remove_streamhandlers, TqdmToLogger
 from via_wind.utils import verify_directory
 from via_wind import raster
 
 
 LOGGER = logging.getLogger(__name__)
 
+# the calibrated ratings only take a few distinct values, so the merged output
+# compresses very well, and is tiled in small blocks for efficient windowed reads
+CALIBRATED_CREATION_OPTIONS = {
+    "tiled": True,
+    "blockxsize": 512,
+    "blockysize": 512,
+    "compress": "zstd",
+    "predictor": 2,
+    "num_threads": "ALL_CPUS",
+}
+
+# ufuncs equivalent to the cdf methods of the scipy.stats distributions used by
+# statsmodels ordinal regression models, which are much faster to call directly
+DISTRIBUTION_CDFS = {
+    "norm": special.ndtr,
+    "logistic": special.expit,
+}
+
 
 def _log_inputs(config):
     """
@@ -115,9 +134,6 @@ def run(merge_directory, out_dir, max_workers=None, _local=True):
 
     merge_path = Path(merge_directory).expanduser()
 
-    LOGGER.info("Loading calibration model")
-    model = sm.load(CALIBRATION_MODEL)
-
     pixel_value_descriptions = {
         "0": "No Turbines Visible",
         "1": "Minimal Visual Impact",
@@ -133,44 +149,81 @@ def run(merge_directory, out_dir, max_workers=None, _local=True):
     in_block_tifs = list(in_blocks_path.glob("*.tif"))
     LOGGER.info("Calibrating blocks")
 
-    futures = {}
-    with ProcessPoolExecutor(max_workers=max_workers) as pool:
-        for in_block_tif in in_block_tifs:
-            future = pool.submit(
-                calibrate,
-                in_block_tif,
-                model,
-                out_blocks_path,
-                pixel_value_descriptions,
-            )
-            futures[future] = in_block_tif
-
-    with tqdm.tqdm(
-        total=len(futures),
-        desc="Calbirating blocks",
-        ascii=True,
-        file=open(os.devnull, "w"),
-    ) as pbar:
-        for future in as_completed(futures):
-            try:
-                future.result()
-                pbar.update(1)
-                LOGGER.info(pbar)
-            except Exception as e:
-                raise e.__class__(f"Error with map {futures[future]}: {e}")
+    # blocks are dispatched to the workers in chunks, to reduce the scheduling overhead
+    # when there are many blocks, but small enough chunks (~20 per worker) that the
+    # load stays balanced when blocks take different amounts of time to process
+    n_workers = max_workers or os.cpu_count()
+    chunksize = max(1, len(in_block_tifs) // (n_workers * 20))
+    calibrate_block = partial(
+        _calibrate_block,
+        out_path=out_blocks_path,
+        pixel_value_descriptions=pixel_value_descriptions,
+    )
+
+    # each worker loads the calibration model once, when it starts, rather than having
+    # the model pickled and sent along with every block
+    with (
+        ProcessPoolExecutor(
+            max_workers=max_workers, initializer=load_calibration_model
+        ) as pool,
+        tqdm.tqdm(
+            total=len(in_block_tifs),
+            desc="Calbirating blocks",
+            ascii=True,
+            file=TqdmToLogger(LOGGER),
+        ) as pbar,
+    ):
+        # errors are raised for the first block in a chunk, so the path of the block
+        # that failed is added to the error message by the worker
+        for _ in pool.map(calibrate_block, in_block_tifs, chunksize=chunksize):
+            pbar.update(1)
 
     LOGGER.info("Merging blocks")
     out_merged_tif = out_path.joinpath("visual_impact.tif")
-    raster.merge_tifs(out_blocks_path, out_merged_tif, pattern="block*.tif")
     # add descriptions of pixel values as metadata
-    with rasterio.open(out_merged_tif, "r+") as rast:
-        rast.update_tags(**pixel_value_descriptions)
+    raster.merge_tifs(
+        out_blocks_path,
+        out_merged_tif,
+        pattern="block*.tif",
+        tags=pixel_value_descriptions,
+        creation_options=CALIBRATED_CREATION_OPTIONS,
+    )
 
     LOGGER.info("Process completed sucessfully.")
 
     return out_merged_tif.as_posix()
 
 
+def _calibrate_block(viewshed_tif, out_path, pixel_value_descriptions):
+    """
+    Calibrate an individual viewshed geotiff using the default calibration model
+    (via_wind.CALIBRATION_MODEL). Intended to be run in worker processes: the model is
+    only loaded once per process and reused for all subsequent blocks.
+
+    Parameters
+    ----------
+    viewshed_tif : str
+        Path to merged viewshed tif (can be either a block or the full mosaicked tif)
+    out_path : str
+        Path to output directory where the calibrated tif will be saved. Output tif
+        will have the same name as the viewshed_tif.
+    pixel_value_descriptions : dict
+        Dictionary describing the meaning of the output rating values.
+
+    Raises
+    ------
+    Exception
+        Any error raised while calibrating the block is re-raised, as the same type,
+        with the path to the viewshed_tif included in the message.
+    """
+    try:
+        calibrate(
+            viewshed_tif, load_calibration_model(), out_path, pixel_value_descriptions
+        )
+    except Exception as e:
+        raise e.__class__(f"Error with map {viewshed_tif}: {e}") from e
+
+
 def calibrate(viewshed_tif, stats_model, out_path, pixel_value_descriptions):
     """
     Calibrate an individual viewshed geotiff to visual impact ratings using the
@@ -194,23 +247,37 @@ def calibrate(viewshed_tif, stats_model, out_path, pixel_value_descriptions):
         crs = rast.crs
         profile = rast.profile
 
-    # log transform the input fov_pct values and reshape for input to the model
-    # note: fov_pct = 0 -> Turbines not visible, and is out of range for np.log,
-    # so mask these pixels out for now
-    nonzero = fov_pct > 0
-    x_data = np.log(fov_pct[nonzero]).ravel().reshape(-1, 1)
-
-    # make predictions
-    predicted = stats_model.model.predict(stats_model.params, exog=x_data, which="prob")
-    pred_choice = predicted.argmax(1)
     # create the result raster
-    # note: 0 = not visible, so all other values have to be increased by 1
-    calibrated = np.zeros(fov_pct.shape, dtype="int8")
-    calibrated[nonzero] = pred_choice + 1
-
     # calibration model wasn't trained on data with fov_pct = 0 (i.e., turbines not
-    # visible), so manually override these values and set to 0
-    calibrated[fov_pct == 0] = 0
+    # visible), so these pixels are left at the initial value of 0
+    calibrated = np.zeros(fov_pct.size, dtype="int8")
+
+    # note: fov_pct = 0 -> Turbines not visible, and is out of range for np.log,
+    # so mask these pixels out for now. the positions of the visible pixels are found
+    # once, and used to both read the inputs and write the results
+    flat_fov_pct = fov_pct.ravel()
+    visible = np.flatnonzero(flat_fov_pct > 0)
+    # blocks where turbines are not visible anywhere are common, and can be saved
+    # as-is, without running the model
+    if visible.size > 0:
+        # log transform the input fov_pct values and reshape for input to the model
+        # integer indexing already returns a new 1D array, so for floating point
+        # inputs, take the log in place. the log of integer inputs has a different
+        # (floating point) dtype, so it cannot be taken in place. the second
+        # dimension is added as a view
+        x_data = flat_fov_pct[visible]
+        if np.issubdtype(x_data.dtype, np.floating):
+            np.log(x_data, out=x_data)
+        else:
+            x_data = np.log(x_data)
+        x_data = x_data[:, np.newaxis]
+
+        # make predictions
+        pred_choice = predict_choice(stats_model, x_data)
+        # note: 0 = not visible, so all other values have to be increased by 1
+        pred_choice += 1
+        calibrated[visible] = pred_choice
+    calibrated = calibrated.reshape(fov_pct.shape)
 
     out_tif = out_path.joinpath(viewshed_tif.name)
     raster.save_to_geotiff(
@@ -223,6 +290,52 @@ def calibrate(viewshed_tif, stats_model, out_path, pixel_value_descriptions):
     )
 
 
+def predict_choice(stats_model, x_data):
+    """
+    Predict the most probable category for each observation using an ordinal
+    regression model. Equivalent to
+    ``stats_model.model.predict(stats_model.params, exog=x_data).argmax(1)``, but the
+    probability of each category is evaluated and compared one category at a time,
+    on one dimensional arrays, rather than building several two dimensional arrays
+    with the probabilities for all categories. For probit and logit models, the
+    cumulative distribution function is evaluated with the equivalent scipy.special
+    ufunc, skipping the argument checking overhead of the scipy.stats distribution.
+
+    Parameters
+    ----------
+    stats_model : statsmodels.miscmodels.ordinal_model.OrderedResultsWrapper
+        Statistical (Ordinal Regression) model used for predictions.
+    x_data : numpy.ndarray
+        Two dimensional array of exogenous data, with observations in rows.
+
+    Returns
+    -------
+    numpy.ndarray
+        One dimensional int8 array with the index of the most probable category for
+        each observation.
+    """
+    model = stats_model.model
+    params = stats_model.params
+    thresholds = model.transform_threshold_params(params)
+    linpred = model.predict(params, exog=x_data, which="linpred")
+    cdf = DISTRIBUTION_CDFS.get(getattr(model.distr, "name", None), model.cdf)
+
+    best_prob = np.full(linpred.shape, -1.0)
+    choice = np.zeros(linpred.shape, dtype="int8")
+    lower_cdf = cdf(thresholds[0] - linpred)
+    for i, threshold in enumerate(thresholds[1:]):
+        upper_cdf = cdf(threshold - linpred)
+        prob = np.maximum(upper_cdf - lower_cdf, 0)
+        # only replace on strictly greater probabilities, so that ties go to the
+        # lowest category, as with argmax
+        is_better = prob > best_prob
+        choice[is_better] = i
+        np.copyto(best_prob, prob, where=is_better)
+        lower_cdf = upper_cdf
+
+    return choice
+
+
 calibrate_cmd = CLICommandFromFunction(
     function=run,
     name="calibrate",
@@ -3,9 +3,10 @@
 fov module - sets up CLI for fov command using nrel-gaps
 """
 import logging
-from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import math
 import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import tqdm
 from gaps.cli import as_click_command, CLICommandFromFunction
@@ -13,12 +14,15 @@ import numpy as np
 import pandas as pd
 
 from via_wind import __version__
-from via_wind.log import init_logger, remove_streamhandlers
+from via_wind.log import init_logger, remove_streamhandlers, TqdmToLogger
 from via_wind.config import SilouettesConfig
+from via_wind.utils import find_missing_paths
 from via_wind.image import mean_image_intensity
 
 
 LOGGER = logging.getLogger(__name__)
+# maximum number of threads used to read images for each silouette directory
+MAX_IMAGE_THREADS = 8
 
 
 def _parse_silouette_directories(silouette_directories):
@@ -87,9 +91,9 @@ def _parse_silouette_directories(silouette_directories):
         return [silouette_directories]
 
     if isinstance(silouette_directories, list):
-        for silouette_directory in silouette_directories:
-            if Path(silouette_directory).exists() is False:
-                raise FileNotFoundError(f"Could not find folder {silouette_directory}")
+        missing_directories = find_missing_paths(silouette_directories)
+        if missing_directories:
+            raise FileNotFoundError(f"Could not find folder {missing_directories[0]}")
         return silouette_directories
 
     raise TypeError(
@@ -199,38 +203,80 @@ def run(
     out_path = Path(out_dir).joinpath("fov").expanduser()
     out_path.mkdir(exist_ok=True, parents=False)
 
+    out_all_csv = Path(out_path).joinpath("combined_fov_lkup.csv")
+    LOGGER.info(f"Results will be combined and saved to {out_all_csv}")
+
+    # each worker process reads images in its own thread pool, so the CPUs are split
+    # between the processes to avoid starting more threads than there are CPUs
+    n_workers = min(max_workers or os.cpu_count(), len(silouette_directories))
+    image_threads = max(1, min(MAX_IMAGE_THREADS, os.cpu_count() // max(n_workers, 1)))
+
     futures = {}
-    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+    with (
+        ProcessPoolExecutor(max_workers=max_workers) as pool,
+        open(out_all_csv, "w", newline="", encoding="utf-8") as f,
+    ):
         for silouette_directory in silouette_directories:
             future = pool.submit(
-                calc_fov, silouette_directory, out_path, _log_directory, _verbose
+                calc_fov,
+                silouette_directory,
+                out_path,
+                _log_directory,
+                _verbose,
+                image_threads=image_threads,
             )
             futures[future] = silouette_directory
 
-    fov_dfs = []
-    for future in as_completed(futures):
-        try:
-            out_csv = future.result()
-        except Exception as e:
-            raise e.__class__(f"Error with map {futures[future]}: {e}")
+        # results for each directory are appended to the combined CSV as soon as they
+        # are available, while the remaining directories are still being processed
+        columns = None
+        # if a directory has different columns than the earlier directories, results
+        # can no longer be appended under the same header, so the results written so
+        # far and all remaining results are combined in memory instead
+        fov_dfs = None
+        for future in as_completed(futures):
+            try:
+                # the worker also writes its results to a CSV, but returns the
+                # dataframe so that the CSV does not need to be parsed again here
+                _, fov_df = future.result()
+            except Exception as e:
+                raise e.__class__(f"Error with map {futures[future]}: {e}")
+
+            if (
+                fov_dfs is None
+                and columns is not None
+                and set(fov_df.columns) != set(columns)
+            ):
+                LOGGER.warning(
+                    f"Columns of results for {futures[future]} do not match the "
+                    "results of other directories. All results will be combined in "
+                    "memory."
+                )
+                f.flush()
+                fov_dfs = [pd.read_csv(out_all_csv)]
 
-        fov_dfs.append(pd.read_csv(out_csv))
+            if fov_dfs is not None:
+                fov_dfs.append(fov_df)
+                continue
 
-    LOGGER.info("Successfully completed analyzing FOV for all directories.")
+            fov_df.to_csv(f, header=columns is None, index=False, columns=columns)
+            if columns is None:
+                columns = fov_df.columns.tolist()
 
-    LOGGER.info("Merging results")
-    all_fov_df = pd.concat(fov_dfs, ignore_index=True)
+        if fov_dfs is not None:
+            LOGGER.info("Merging results")
+            f.seek(0)
+            f.truncate()
+            pd.concat(fov_dfs, ignore_index=True).to_csv(f, header=True, index=False)
 
-    out_all_csv = Path(out_path).joinpath("combined_fov_lkup.csv")
-    LOGGER.info(f"Saving combined FOV lookup CSV to {out_all_csv}")
-    all_fov_df.to_csv(out_all_csv, header=True, index=False)
+    LOGGER.info("Successfully completed analyzing FOV for all directories.")
 
     LOGGER.info("All processing completed successfully.")
 
     return out_all_csv.as_posix()
 
 
-def calc_fov(silouette_directory, out_path, log_directory, verbose):
+def calc_fov(silouette_directory, out_path, log_directory, verbose, image_threads=None):
     """
     Analyze silouette images to determine the percent of the field-of-view (FOV)
     occupied by each configuration of the turbine. Results from all images are compiled
@@ -249,6 +295,15 @@ def calc_fov(silouette_directory, out_path, log_directory, verbose):
         Path to log output directory.
     verbose : bool
         Flag to signal ``DEBUG`` verbosity (``verbose=True``).
+    image_threads : [int, NoneType], optional
+        Number of threads used to read the images, by default None, which uses up to
+        MAX_IMAGE_THREADS threads, limited to the number of available CPUs.
+
+    Returns
+    -------
+    tuple
+        Returns a tuple with two elements: the first element is the path to the output
+        CSV and the second is a pandas.DataFrame with the results saved to that CSV.
     """
 
     img_path = Path(silouette_directory)
@@ -284,8 +339,9 @@ def calc_fov(silouette_directory, out_path, log_directory, verbose):
     lens_mm = config.camera.lens_mm
 
     # this is a well-established formula for deriving the angular FOV for a camera
-    photo_fov_vertical = np.rad2deg(2 * np.arctan(film_height_mm / (lens_mm * 2)))
-    photo_fov_horizontal = np.rad2deg(2 * np.arctan(film_width_mm / (lens_mm * 2)))
+    # (these are scalars, so math is used rather than numpy ufuncs)
+    photo_fov_vertical = math.degrees(2 * math.atan(film_height_mm / (lens_mm * 2)))
+    photo_fov_horizontal = math.degrees(2 * math.atan(film_width_mm / (lens_mm * 2)))
 
     # From Minelli et al. 2014
     # https://www.sciencedirect.com/science/article/pii/S0195925514000675
@@ -299,39 +355,47 @@ def calc_fov(silouette_directory, out_path, log_directory, verbose):
         / full_fov_horizontal
     )
 
-    results = []
-    with tqdm.tqdm(
-        total=len(images),
-        desc="Analyzing silouettes",
-        ascii=True,
-        file=open(os.devnull, "w"),
-    ) as pbar:
-        for image in images:
-            # calculate the visual impact of the turbine
-            # (i.e., the % of the FOV occupied by the turbine silouette)
-            vis_impact = mean_image_intensity(image) * photo_to_full_fov_ratio
-
-            # parse the image name to determine the distance of the turbine from the
-            # camera, the rotation of the turbine, and the obstruction height
-            dist, rot, obs = image.name.replace(".png", "").split("-", maxsplit=3)
-
-            image_data = turbine_params.copy()
-            image_data.update(
-                {
-                    "distance_m": float(dist.replace("d", "").replace("m", "")),
-                    "rotation": rot.replace("r", ""),
-                    "obstruction_height_m": float(
-                        obs.replace("o", "").replace("m", "")
-                    ),
-                    "pct_fov": round(vis_impact * 100, 5),
-                }
-            )
-            results.append(image_data)
+    # images are read and analyzed in a thread pool: decoding the PNGs releases the
+    # GIL, so the images can be decoded in parallel within this process
+    if image_threads is None:
+        image_threads = min(MAX_IMAGE_THREADS, os.cpu_count())
+    intensities = np.empty(len(images), dtype="float64")
+    with (
+        ThreadPoolExecutor(max_workers=image_threads) as thread_pool,
+        tqdm.tqdm(
+            total=len(images),
+            desc="Analyzing silouettes",
+            ascii=True,
+            file=TqdmToLogger(logger),
+        ) as pbar,
+    ):
+        for i, intensity in enumerate(thread_pool.map(mean_image_intensity, images)):
+            intensities[i] = intensity
             pbar.update(1)
-            logger.info(pbar)
 
     logger.info("Combining and saving results.")
-    results_df = pd.DataFrame(results)
+    # calculate the visual impact of the turbine
+    # (i.e., the % of the FOV occupied by the turbine silouette)
+    vis_impact = intensities * photo_to_full_fov_ratio
+
+    # parse the image names to determine the distance of the turbine from the
+    # camera, the rotation of the turbine, and the obstruction height
+    image_names = pd.Series([image.name for image in images], dtype="object")
+    name_parts = image_names.str.removesuffix(".png").str.split("-", n=2, expand=True)
+
+    results_df = pd.DataFrame(
+        {
+            **turbine_params,
+            "distance_m": name_parts[0].str.replace("[dm]", "", regex=True).astype(
+                "float64"
+            ),
+            "rotation": name_parts[1].str.replace("r", "", regex=False),
+            "obstruction_height_m": name_parts[2]
+            .str.replace("[om]", "", regex=True)
+            .astype("float64"),
+            "pct_fov": np.round(vis_impact * 100, 5),
+        }
+    )
     results_df.sort_values(
         by=["rotation", "distance_m", "obstruction_height_m"],
         ascending=True,
@@ -342,7 +406,7 @@ def calc_fov(silouette_directory, out_path, log_directory, verbose):
     results_df.to_csv(out_csv, header=True, index=False)
     logger.info("Process completed successfully.")
 
-    return out_csv
+    return out_csv, results_df
 
 
 fov_cmd = CLICommandFromFunction(
@@ -113,43 +113,47 @@ def run(input_raster, mask_raster, out_dir, _local=True):
     out_raster_path = out_path.joinpath(input_raster_path.name)
 
 
-    LOGGER.info("Checking for matching properties of input and mask rasters")
-    in_info = raster.get_raster_info(input_raster_path)
-    mask_info = raster.get_raster_info(mask_raster_path)
-    for check_key in ["crs", "resolution", "shape"]:
-        if in_info.get(check_key) != mask_info.get(check_key):
-            raise ValueError(
-                f"Input Raster and Mask Raster {check_key} do not match."
-            )
-
     with (
         rasterio.open(input_raster_path, "r") as in_src,
         rasterio.open(mask_raster_path, "r") as mask_src
     ):
+        LOGGER.info("Checking for matching properties of input and mask rasters")
+        checks = {
+            "crs": (in_src.crs, mask_src.crs),
+            "resolution": (in_src.res, mask_src.res),
+            "shape": (in_src.shape, mask_src.shape),
+        }
+        for check_key, (in_value, mask_value) in checks.items():
+            if in_value != mask_value:
+                raise ValueError(
+                    f"Input Raster and Mask Raster {check_key} do not match."
+                )
 
         in_transform = in_src.transform
         mask_transform = mask_src.transform
         if not np.isclose(in_transform, mask_transform).all():
             raise ValueError("Input Raster and Mask Raster transform do not match.")
 
-        LOGGER.info("Loading mask")
-        vis_mask = mask_src.read(1) <= 0
-
-        LOGGER.info("Applying mask")
-        masked = in_src.read(1) * vis_mask
-
-        nodata = in_src.nodata
-        tags = in_src.tags()
-
-    LOGGER.info(f"Saving results to {out_raster_path}")
-    raster.save_to_geotiff(
-        masked,
-        affine=in_transform,
-        crs=in_info["crs"],
-        out_tif=out_raster_path,
-        nodata_value=nodata,
-        tags=tags
-    )
+        out_profile = raster.geotiff_profile(
+            in_src.dtypes[0],
+            in_src.shape,
+            in_transform,
+            in_src.crs,
+            nodata_value=in_src.nodata,
+        )
+
+        # stream the rasters through the mask block by block, following the block
+        # layout of the output, so that only one block of each raster is in memory
+        LOGGER.info(f"Applying mask and saving results to {out_raster_path}")
+        with rasterio.open(out_raster_path, "w", **out_profile) as out_rast:
+            for _, window in out_rast.block_windows(1):
+                in_block = in_src.read(1, window=window)
+                vis_mask = mask_src.read(1, window=window) <= 0
+                # zero out the not visible pixels in place, rather than multiplying
+                # every pixel by the mask
+                in_block[~vis_mask] = 0
+                out_rast.write(in_block, 1, window=window)
+            out_rast.update_tags(**in_src.tags())
 
     LOGGER.info("Process completed sucessfully.")
 
@@ -3,23 +3,29 @@
 merge module - sets up CLI for merge command using nrel-gaps
 """
 import logging
-from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
-from itertools import product
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 
+import rasterio
+from rasterio.windows import Window
 import tqdm
 from gaps.cli import as_click_command, CLICommandFromFunction
 import numpy as np
 
 from via_wind import __version__
-from via_wind.log import init_logger, remove_streamhandlers
+from via_wind.log import init_logger, remove_streamhandlers, TqdmToLogger
 from via_wind.utils import verify_directory
 from via_wind import raster
 
 
 LOGGER = logging.getLogger(__name__)
 
+# inputs shared by all of the blocks mosaicked by a worker process, set by
+# _init_worker() when the worker starts
+_WORKER_STATE = {}
+
 
 def _log_inputs(config):
     """
@@ -86,6 +92,8 @@ def run(viewsheds_directory, out_dir, block_size=3600, max_workers=None, _local=
         be overwritten.
     block_size : int, optional
         Size of blocks used for mosaicking overlapping viewshed tifs, by default 3600.
+        Block sizes that are multiples of 16 allow the merged output to be tiled so
+        that each block is written to separate tiles, and compressed.
     max_workers : [int, NoneType], optional
         Maximum number of workers to use for multiprocessing, by default None, which
         uses all available CPUs.
@@ -125,46 +133,145 @@ def run(viewsheds_directory, out_dir, block_size=3600, max_workers=None, _local=
     blocks_path.mkdir(exist_ok=True)
     row_offsets = np.arange(0, vrt_height + 1, block_size)
     col_offsets = np.arange(0, vrt_width + 1, block_size)
-    offsets = list(product(row_offsets, col_offsets))
-
-    futures = {}
-    with ProcessPoolExecutor(max_workers=max_workers) as pool:
-        for row_offset, col_offset in offsets:
-            future = pool.submit(
-                raster.mosaic_block,
-                vrt_sources_df,
-                vrt_profile,
-                blocks_path,
-                col_offset,
-                row_offset,
-                block_size,
-            )
+    row_grid, col_grid = np.meshgrid(row_offsets, col_offsets, indexing="ij")
+    offsets = np.column_stack([row_grid.ravel(), col_grid.ravel()])
+    # blocks that do not intersect any of the viewshed rasters would be empty, so
+    # they are skipped. the gaps are filled with zeros when the blocks are merged
+    offsets = raster.find_blocks_with_sources(
+        vrt_sources_df, vrt_profile, offsets, block_size
+    )
+    LOGGER.info(
+        f"Skipping {len(row_offsets) * len(col_offsets) - len(offsets)} blocks "
+        "without any viewshed rasters"
+    )
+
+    # blocks are submitted as earlier blocks complete, so that only a limited
+    # number of blocks are pending at any time, rather than all of them at once
+    max_pending = 4 * (max_workers or os.cpu_count())
+    offsets_iter = iter(offsets)
+
+    # the merged output is created up front, and each block is copied into it as soon
+    # as the block is complete, rather than merging all of the blocks at the end.
+    # blocks without any viewshed rasters are never written, and are left as zeros
+    out_merged_tif = out_path.joinpath("fov-pct_sum.tif")
+    out_profile = raster.geotiff_profile(
+        vrt_profile["dtype"],
+        (vrt_height, vrt_width),
+        vrt_profile["transform"],
+        vrt_info["crs"],
+    )
+    # blocks are written in the order they complete, so the tiles have to divide the
+    # blocks evenly. otherwise, compressed tiles on the edges of blocks are written
+    # more than once, with each rewrite appended to the end of the file. if there is
+    # no tile size that divides the blocks, the output is left uncompressed, so that
+    # tiles are rewritten in place
+    tile_size = raster.aligned_tile_size(block_size)
+    if tile_size is None:
+        LOGGER.info(
+            f"block_size {block_size} is not a multiple of "
+            f"{raster.TILE_SIZE_MULTIPLE}: merged output will not be compressed"
+        )
+        out_profile.pop("compress")
+    else:
+        out_profile.update(blockxsize=tile_size, blockysize=tile_size)
+
+    # the inputs shared by all blocks are sent to each worker once, when it starts,
+    # so that only the offsets of each block are sent with the block
+    with (
+        ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(vrt_sources_df, vrt_profile, blocks_path, block_size),
+        ) as pool,
+        tqdm.tqdm(
+            total=len(offsets),
+            desc="Mosaicking blocks",
+            ascii=True,
+            file=TqdmToLogger(LOGGER),
+        ) as pbar,
+        rasterio.open(out_merged_tif, "w", **out_profile) as out_rast,
+    ):
+        futures = {}
+        for row_offset, col_offset in islice(offsets_iter, max_pending):
+            future = pool.submit(_mosaic_block, row_offset, col_offset)
             futures[future] = (row_offset, col_offset)
 
-    with tqdm.tqdm(
-        total=len(futures),
-        desc="Mosaicking blocks",
-        ascii=True,
-        file=open(os.devnull, "w"),
-    ) as pbar:
-        for future in as_completed(futures):
-            try:
-                future.result()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                row_offset, col_offset = futures.pop(future)
+                try:
+                    block_tif = future.result()
+                except Exception as e:
+                    raise e.__class__(f"Error with map {(row_offset, col_offset)}: {e}")
+
+                with rasterio.open(block_tif, "r") as block:
+                    block_window = Window(
+                        col_offset, row_offset, block.width, block.height
+                    )
+                    out_rast.write(block.read(1), 1, window=block_window)
                 pbar.update(1)
-                LOGGER.info(pbar)
-            except Exception as e:
-                raise e.__class__(f"Error with map {futures[future]}: {e}")
 
-    LOGGER.info("Merging blocks")
-    raster.merge_tifs(
-        blocks_path, out_path.joinpath("fov-pct_sum.tif"), pattern="block*.tif"
-    )
+            for row_offset, col_offset in islice(offsets_iter, len(done)):
+                future = pool.submit(_mosaic_block, row_offset, col_offset)
+                futures[future] = (row_offset, col_offset)
 
     LOGGER.info("Process completed sucessfully.")
 
     return out_path.as_posix()
 
 
+def _init_worker(vrt_sources_df, vrt_profile, blocks_path, block_size):
+    """
+    Initialize a worker process for mosaicking blocks, storing the inputs that are
+    shared by all blocks in the worker's state.
+
+    Parameters
+    ----------
+    vrt_sources_df : geopandas.GeoDataFrame
+        GeoDataFrame containing information about the source rasters to mosaic
+        and their bounds relative to the full VRT.
+    vrt_profile : dict
+        Rasterio Profile of the full VRT.
+    blocks_path : pathlib.Path
+        Output path to which the mosaicked blocks will be saved.
+    block_size : int
+        Size of the blocks to mosaic.
+    """
+    _WORKER_STATE.update(
+        vrt_sources_df=vrt_sources_df,
+        vrt_profile=vrt_profile,
+        blocks_path=blocks_path,
+        block_size=block_size,
+    )
+
+
+def _mosaic_block(row_offset, col_offset):
+    """
+    Mosaic a single block in a worker process initialized with _init_worker().
+
+    Parameters
+    ----------
+    row_offset : int
+        Row offset where the block starts, relative to the top left of the VRT.
+    col_offset : int
+        Column offset where the block starts, relative to the top left of the VRT.
+
+    Returns
+    -------
+    pathlib.Path
+        Path to the output mosaicked block.
+    """
+    return raster.mosaic_block(
+        _WORKER_STATE["vrt_sources_df"],
+        _WORKER_STATE["vrt_profile"],
+        _WORKER_STATE["blocks_path"],
+        col_offset,
+        row_offset,
+        _WORKER_STATE["block_size"],
+    )
+
+
 merge_cmd = CLICommandFromFunction(
     function=run,
     name="merge",
@@ -3,16 +3,18 @@
 silouettes module - sets up CLI for silouettes command using nrel-gaps
 """
 import logging
+import multiprocessing
 from pathlib import Path
 import shutil
-import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import tqdm
 from gaps.cli import as_click_command, CLICommandFromFunction
 
 from via_wind import __version__
-from via_wind.log import init_logger, CSilencer
+from via_wind.log import init_logger, CSilencer, TqdmToLogger
 from via_wind.config import SilouettesConfig
+from via_wind.utils import find_missing_paths
 
 
 LOGGER = logging.getLogger(__name__)
@@ -75,9 +77,9 @@ def _parse_silouette_configs(silouette_configs):
         return [silouette_configs]
 
     if isinstance(silouette_configs, list):
-        for silouette_config in silouette_configs:
-            if Path(silouette_config).exists() is False:
-                raise FileNotFoundError(f"Could not find file {silouette_config}")
+        missing_configs = find_missing_paths(silouette_configs)
+        if missing_configs:
+            raise FileNotFoundError(f"Could not find file {missing_configs[0]}")
         return silouette_configs
 
     raise TypeError("Invalid type for silouettes_config: must be either str or list.")
@@ -142,6 +144,7 @@ def run(
     job_name,
     _log_directory,
     _verbose,
+    max_workers=1,
     _local=True,
 ):
     """
@@ -164,6 +167,12 @@ def run(
         Path to log output directory.
     _verbose : bool
         Flag to signal ``DEBUG`` verbosity (``verbose=True``).
+    max_workers : [int, NoneType], optional
+        Maximum number of Blender processes used to render the silouettes for each
+        configuration, by default 1, which renders all silouettes in the current
+        process. None uses all available CPUs. Each process renders with its own
+        Blender session, so more than one process per GPU may not improve
+        performance.
     _local : bool
         Flag indicating whether the code is being run locally or via HPC job
         submissions. NOTE: This is not a user provided parameter - it is determined
@@ -183,14 +192,23 @@ def run(
     out_path = Path(out_dir).joinpath("silouettes").expanduser()
     out_path.mkdir(exist_ok=True, parents=False)
 
-    create_silouettes(silouette_configs, out_path, job_name, _log_directory, _verbose)
+    create_silouettes(
+        silouette_configs,
+        out_path,
+        job_name,
+        _log_directory,
+        _verbose,
+        max_workers=max_workers,
+    )
 
     logger.info("Completed processing successfully.")
 
     return out_path.joinpath("*").as_posix()
 
 
-def create_silouettes(config, out_path, job_name, _log_directory, _verbose):
+def create_silouettes(
+    config, out_path, job_name, _log_directory, _verbose, max_workers=1
+):
     # pylint: disable=import-outside-toplevel
     """
     Simulates turbine silouettes at specified distances and orientations based on the
@@ -214,6 +232,10 @@ def create_silouettes(config, out_path, job_name, _log_directory, _verbose):
         Path to log output directory.
     _verbose : bool
         Flag to signal ``DEBUG`` verbosity (``verbose=True``).
+    max_workers : [int, NoneType], optional
+        Maximum number of Blender processes used to render the silouettes, by default
+        1, which renders all silouettes in the current process. None uses all
+        available CPUs.
     """
     # imports here because bpy has some stdout that you can't turn off and
     # this keeps it from printing unless this function is run
@@ -243,82 +265,94 @@ def create_silouettes(config, out_path, job_name, _log_directory, _verbose):
     logger.info("Copying configuration file to output directory")
     shutil.copy(config_path, output_path.joinpath("config.json"))
 
-    # reset Blender scene
-    logger.info("Resetting blender scene")
-    with CSilencer():
-        bpy.ops.wm.read_factory_settings(use_empty=True)
-
-    # set up scene
-    logger.info("Setting up Blender scene and objects")
-    scene = blender.configure_scene(config)
-    # create world and attach to scene
-    world = blender.create_world()
-    scene.world = world
-    # create sun and add to scene
-    sun = blender.create_sun(config)
-    scene.collection.objects.link(sun)
-
-    # create surface materials
-    turb_mat = blender.create_turbine_surface_material()
-    obs_mat = blender.create_obstruction_surface_material()
-
-    # create turbine components
-    # Note: these are automatically added to the scene
-    rotors = blender.create_rotors(config, surface_material=turb_mat)
-    tower = blender.create_tower(config, surface_material=turb_mat)
-
-    # create obstruction
-    obstruction = blender.create_obstruction(surface_material=obs_mat)
-
-    # set up camera
-    camera = blender.create_camera(config)
-    blender.set_camera_tracking(camera, track_to_obj=rotors)
-    scene.collection.objects.link(camera)
-    scene.camera = camera
-
-    n_iters = (
-        len(config.turbine.obstruction_heights)
-        * len(config.turbine.distances_to_camera_m)
-        * len(config.turbine.rotations)
-    )
-    with tqdm.tqdm(
-        total=n_iters,
-        desc="Running Silouette Simulations",
-        ascii=True,
-        file=open(os.devnull, "w"),
-    ) as pbar:
-        for obstruction_height in config.turbine.obstruction_heights:
-            for distance in config.turbine.distances_to_camera_m:
-                for rotation in config.turbine.rotations:
-                    # reposition the turbine
-                    blender.position_turbine(
-                        rotors,
-                        tower,
-                        config,
-                        distance_to_camera_m=distance,
-                        rotation=rotation,
+    frames = blender.get_frames(config)
+    if max_workers == 1:
+        # reset Blender scene
+        logger.info("Resetting blender scene")
+        with CSilencer():
+            bpy.ops.wm.read_factory_settings(use_empty=True)
+
+        # set up scene and objects and render all of the images in this Blender session
+        logger.info("Setting up Blender scene and objects")
+        with tqdm.tqdm(
+            total=len(frames),
+            desc="Running Silouette Simulations",
+            ascii=True,
+            file=TqdmToLogger(logger),
+        ) as pbar:
+            blender.batch_render(config, output_path, progress_callback=pbar.update)
+    else:
+        # split the frames into contiguous batches, so that each batch mostly shares
+        # the same turbine position, and render each batch in a separate Blender
+        # session. there are several batches per process, to keep the load balanced
+        n_workers = max_workers or multiprocessing.cpu_count()
+        n_batches = min(len(frames), n_workers * 4)
+        batches = [
+            frames[len(frames) * i // n_batches : len(frames) * (i + 1) // n_batches]
+            for i in range(n_batches)
+        ]
+        logger.info(
+            f"Rendering {len(frames)} silouettes in {n_batches} batches with up to "
+            f"{n_workers} Blender processes"
+        )
+        # Blender is not fork safe, so worker processes are spawned
+        with (
+            ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool,
+            tqdm.tqdm(
+                total=len(frames),
+                desc="Running Silouette Simulations",
+                ascii=True,
+                file=TqdmToLogger(logger),
+            ) as pbar,
+        ):
+            futures = {}
+            for batch in batches:
+                future = pool.submit(
+                    _render_frames, config_path.as_posix(), output_path, batch
+                )
+                futures[future] = batch
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    pbar.update(len(futures[future]))
+                except Exception as e:
+                    raise e.__class__(
+                        f"Error rendering frames starting at {futures[future][0]}: {e}"
                     )
 
-                    # reposition the obstruction
-                    blender.position_obstruction(
-                        obstruction,
-                        config,
-                        height_m=obstruction_height,
-                        turb_distance_to_camera_m=distance,
-                        turb_rotation=rotation,
-                    )
+    logger.info(f"Completed silouettes for {config.name}.")
 
-                    # render scene to output image
-                    out_image = output_path.joinpath(
-                        f"d{distance}m-r{rotation}-o{obstruction_height}m.png"
-                    )
-                    blender.render_image(scene, out_image)
 
-                    # update progress
-                    pbar.update(1)
-                    logger.info(pbar)
+def _render_frames(config, output_path, frames):
+    # pylint: disable=import-outside-toplevel
+    """
+    Render a batch of silouettes in a new Blender session. Intended to be run in
+    worker processes spawned by create_silouettes().
 
-    logger.info(f"Completed silouettes for {config.name}.")
+    Parameters
+    ----------
+    config : str
+        Path to JSON configuration file.
+    output_path : pathlib.Path
+        Path to the directory in which output images will be saved.
+    frames : list
+        List of (rotation, distance to camera, obstruction height) tuples to render.
+
+    Returns
+    -------
+    list
+        List of file paths (as strings) for the rendered images.
+    """
+    with CSilencer():
+        import bpy
+        from via_wind import blender
+
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    return blender.batch_render(SilouettesConfig(config), output_path, frames=frames)
 
 
 silouettes_cmd = CLICommandFromFunction(
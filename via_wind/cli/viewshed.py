@@ -5,7 +5,6 @@ viewshed module - sets up CLI for viewshed command using nrel-gaps
 import logging
 from pathlib import Path
 from concurrent.futures import ProcessPoolExecutor, as_completed
-import os
 
 import rasterio
 from rasterio.transform import Affine
@@ -18,7 +17,7 @@ from pyogrio import read_info
 import pyproj
 
 from via_wind import __version__
-from via_wind.log import init_logger
+from via_wind.log import init_logger, TqdmToLogger
 from via_wind.utils import verify_file
 from via_wind import raster, visibility, measures
 
@@ -149,7 +148,7 @@ def run(
     ----------
     turbines_fpath : str
         Path to input turbines dataset. Should be a GIS Vector format (e.g., GeoPackage,
-        Shapefile, etc).
+        Shapefile, FlatGeobuf, etc).
     fov_lkup_fpath : str
         FOV Lookup table CSV. Typically produced by the fov command.
     elev_fpath : _type_
@@ -291,13 +290,12 @@ def run(
         total=len(futures),
         desc="Analyzing turbine viewsheds",
         ascii=True,
-        file=open(os.devnull, "w"),
+        file=TqdmToLogger(logger),
     ) as pbar:
         for future in as_completed(futures):
             try:
                 future.result()
                 pbar.update(1)
-                logger.info(pbar)
             except Exception as e:
                 raise e.__class__(f"Error with map {futures[future]}: {e}")
 
@@ -449,7 +447,7 @@ def viewshed(
         lookangle_array = measures.classify_look_angle(
             direction_from_turbine=direction_array,
             turbine_bearing=turbine_bearing,
-        ).astype("int8")
+        )
 
         # get the percent FOV
         fov_pct = visibility.lookup_fov_pct(
@@ -7,6 +7,44 @@ import json
 from dataclasses import dataclass
 from typing import List, _GenericAlias
 
+import numpy as np
+
+# numpy dtype kinds that correspond to numbers.Number: bool, int, uint, float, complex
+NUMERIC_DTYPE_KINDS = "biufc"
+
+
+def _check_elements_dtype(values, elements_dtype):
+    """
+    Check whether all elements of the input list are instances of the specified
+    dtype(s). Lists of numbers are checked in a single pass by numpy, falling back to
+    checking each element individually for any other case.
+
+    Parameters
+    ----------
+    values : list
+        List of values to check.
+    elements_dtype : tuple
+        Tuple of the allowed element types.
+
+    Returns
+    -------
+    bool
+        True if all elements are instances of the specified type(s), False if not.
+    """
+    if elements_dtype == (Number,):
+        try:
+            values_array = np.asarray(values)
+            if (
+                values_array.ndim == 1
+                and values_array.dtype.kind in NUMERIC_DTYPE_KINDS
+            ):
+                return True
+        except ValueError:
+            # ragged nested lists cannot be converted to an array
+            pass
+
+    return all(isinstance(v, elements_dtype) for v in values)
+
 
 @dataclass
 class BaseParams:
@@ -15,6 +53,25 @@ class BaseParams:
     Base dataclass to be used for loading parameters from a dictionary.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Build the validation schema for each subclass once, at class creation, so that
+        parsing the annotations is not repeated every time an instance is created.
+        """
+        super().__init_subclass__(**kwargs)
+
+        schema = []
+        for attr, dtype in cls.__annotations__.items():
+            # special handling for List[*] dtypes: set dtype to List and get dtype for
+            # list elements
+            if isinstance(dtype, _GenericAlias) and dtype._name == "List":
+                elements_dtype = dtype.__args__
+                dtype = list
+            else:
+                elements_dtype = None
+            schema.append((attr, dtype, elements_dtype))
+        cls._schema = tuple(schema)
+
     def __init__(self, params_dict):
         """
         Initialize the dataclass, loading all known data attributes from the input
@@ -40,15 +97,7 @@ class BaseParams:
                 f"Invalid input for {self.__class__}: must be a dictionary/mapping."
             )
 
-        for attr, dtype in self.__annotations__.items():
-            # special handling for List[*] dtypes: set dtype to List and get dtype for
-            # list elements
-            if isinstance(dtype, _GenericAlias) and dtype._name == "List":
-                elements_dtype = dtype.__args__
-                dtype = list
-            else:
-                elements_dtype = None
-
+        for attr, dtype, elements_dtype in self._schema:
             value = params_dict.get(attr)
 
             if value is None:
@@ -57,14 +106,13 @@ class BaseParams:
             if not isinstance(value, dtype):
                 raise TypeError(f"Invalid input for {attr}: must be type {dtype}")
 
-            if elements_dtype is not None:
-                # check the dtype of the elements of the list
-                for v in value:
-                    if not isinstance(v, elements_dtype):
-                        raise TypeError(
-                            f"Invalid input for {attr}:"
-                            f" elements must be type {elements_dtype}"
-                        )
+            # check the dtype of the elements of the list
+            if elements_dtype is not None and not _check_elements_dtype(
+                value, elements_dtype
+            ):
+                raise TypeError(
+                    f"Invalid input for {attr}: elements must be type {elements_dtype}"
+                )
 
             setattr(self, attr, value)
 
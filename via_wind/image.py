@@ -2,7 +2,8 @@
 """
 image module
 """
-from imageio.v3 import imread
+import numpy as np
+from PIL import Image
 
 
 def mean_image_intensity(image_path):
@@ -15,8 +16,11 @@ def mean_image_intensity(image_path):
 
     Parameters
     ----------
-    image_path : [pathlib.Path, str]
-        Path to image to analyze. Expected to be a black and white image.
+    image_path : [pathlib.Path, str, numpy.ndarray]
+        Path to image to analyze. Expected to be a black and white image. An image that
+        has already been read into an array (e.g., with imageio.v3.imread) may also be
+        passed directly. Images are read with Pillow, which avoids the plugin lookup
+        overhead of imageio when analyzing many images.
 
     Returns
     -------
@@ -30,7 +34,15 @@ def mean_image_intensity(image_path):
         white.
     """
 
-    image_array = imread(image_path)
+    if isinstance(image_path, np.ndarray):
+        image_array = image_path
+    else:
+        with Image.open(image_path) as image:
+            # palette images are expanded to color, as imageio does, so that they
+            # are not mistaken for single band images
+            if image.mode == "P":
+                image = image.convert("RGBA")
+            image_array = np.asarray(image)
     if image_array.ndim != 2:
         raise TypeError(
             "Invalid input image: contains multiple bands/channels. "
@@ -38,9 +50,15 @@ def mean_image_intensity(image_path):
         )
 
     # rescale so that black = 1 and white = 0, with gray in between
-    # (darker gray closer to 1)
-    intensity = (255 - image_array) / 255
-
-    mean_intensity = intensity.mean()
+    # (darker gray closer to 1). for unsigned integer images, this is equivalent to the
+    # mean of (255 - pixel) / 255, but sums the integer pixel values directly rather
+    # than creating a rescaled floating point copy of the image. the integer sum would
+    # wrap negative values and truncate fractional values, so other arrays are
+    # rescaled as floating point
+    if image_array.dtype.kind == "u":
+        max_total = 255 * image_array.size
+        mean_intensity = (max_total - int(image_array.sum(dtype="uint64"))) / max_total
+    else:
+        mean_intensity = float(np.mean(255 - image_array.astype("float64")) / 255)
 
     return mean_intensity
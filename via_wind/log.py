@@ -70,9 +70,26 @@ class CSilencer:
     A context manager that blocks stdout from C programs. Useful for silencing
     messages called from the blender render command.
     Derived from https://stackoverflow.com/a/76381451.
+
+    Silencers can be nested: only the outermost one redirects stdout, and nested
+    silencers do nothing. Wrapping a loop in a single silencer therefore avoids
+    redirecting stdout on each iteration (e.g., for each image rendered with
+    via_wind.blender.render_image).
     """
 
+    # number of currently active silencers
+    _depth = 0
+
     def __init__(self):
+        self._origstdout = None
+        self._oldstdout_fno = None
+
+    def __enter__(self):
+        CSilencer._depth += 1
+        if CSilencer._depth > 1:
+            # stdout is already silenced by an outer silencer
+            return
+
         sys.stdout.flush()
         self._origstdout = sys.stdout
         # special handling for io redirector from pydev
@@ -80,16 +97,17 @@ class CSilencer:
             self._oldstdout_fno = os.dup(sys.stdout.fileno())
         except io.UnsupportedOperation:
             self._oldstdout_fno = None
-        self._devnull = os.open(os.devnull, os.O_WRONLY)
-        self._newstdout = None
-
-    def __enter__(self):
-        self._newstdout = os.dup(1)
-        os.dup2(self._devnull, 1)
-        os.close(self._devnull)
-        sys.stdout = os.fdopen(self._newstdout, "w")
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        newstdout = os.dup(1)
+        os.dup2(devnull, 1)
+        os.close(devnull)
+        sys.stdout = os.fdopen(newstdout, "w")
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        CSilencer._depth -= 1
+        if CSilencer._depth > 0:
+            return
+
         sys.stdout = self._origstdout
         sys.stdout.flush()
         # special handling for io redirector from pydev
@@ -98,6 +116,52 @@ class CSilencer:
             os.close(self._oldstdout_fno)  # Additional close to not leak fd
 
 
+class TqdmToLogger(io.StringIO):
+    """
+    A file-like object that redirects progress bar output from tqdm to a logger. tqdm
+    only formats and writes the progress bar when it refreshes (by default, at most
+    every 0.1 seconds), so progress is logged without formatting a message on every
+    update.
+    """
+
+    def __init__(self, logger, level=logging.INFO):
+        """
+        Parameters
+        ----------
+        logger : logging.Logger
+            Logger to which progress messages will be sent.
+        level : int, optional
+            Logging level for progress messages, by default logging.INFO.
+        """
+        super().__init__()
+        self.logger = logger
+        self.level = level
+
+    def write(self, s):
+        """
+        Log the progress bar message, stripped of the carriage returns and padding
+        tqdm uses for terminal output.
+
+        Parameters
+        ----------
+        s : str
+            Progress bar message written by tqdm.
+
+        Returns
+        -------
+        int
+            Number of characters written.
+        """
+        message = s.strip("\r\n\t ")
+        if message:
+            self.logger.log(self.level, message)
+
+        return len(s)
+
+    def flush(self):
+        """Nothing to flush: messages are logged as they are written."""
+
+
 def remove_streamhandlers(logger):
     """
     Remove StreamHandlers from a logger to stop output to stdout.
@@ -3,6 +3,7 @@
 measures module
 """
 from numbers import Number
+from functools import lru_cache
 
 import numpy as np
 
@@ -22,39 +23,64 @@ def calc_distance_and_direction(shape):
     Returns
     -------
     tuple
-        Returns a tuple of two numpy.ndarrays, where the first array is the distance
-        array and the second is the direciton array.
+        Returns a tuple of two float32 numpy.ndarrays, where the first array is the
+        distance array and the second is the direciton array.
     """
 
-    n_rows, n_cols = shape
+    distance, direction = _calc_distance_and_direction(tuple(shape))
+
+    # results are cached and shared, so return copies that callers are free to modify
+    return distance.copy(), direction.copy()
 
-    if n_rows // 2 == n_rows / 2:
-        # even
-        center_y = (n_rows - 1) / 2
-    else:
-        # odd
-        center_y = n_rows // 2
 
-    if n_cols // 2 == n_cols / 2:
-        # even
-        center_x = (n_cols - 1) / 2
-    else:
-        center_x = n_cols // 2
+@lru_cache(maxsize=32)
+def _calc_distance_and_direction(shape):
+    """
+    Cached implementation of calc_distance_and_direction(). Returned arrays are
+    read-only because they are shared between calls.
 
-    center = (center_y, center_x)
+    Parameters
+    ----------
+    shape : tuple
+        2D tuples specifying the array shape.
 
-    # create grids for the horizontal and vertical distance to the center
-    grid_x, grid_y = np.mgrid[0 : shape[0], 0 : shape[1]].astype(float)
-    grid_x -= center[0]
-    grid_y -= center[1]
+    Returns
+    -------
+    tuple
+        Returns a tuple of two read-only numpy.ndarrays, where the first array is the
+        distance array and the second is the direction array.
+    """
 
-    # calculat the euclidean distances to the center
-    distance = np.hypot(grid_x, grid_y)
+    n_rows, n_cols = shape
+
+    # the center is the middle cell for odd dimensions or halfway between the two
+    # middle cells for even dimensions
+    center_y = (n_rows - 1) / 2
+    center_x = (n_cols - 1) / 2
+
+    # create open grids for the vertical and horizontal distance to the center. these
+    # broadcast against each other, so the full 2D arrays are only materialized once
+    # in the outputs below
+    grid_y, grid_x = np.ogrid[0:n_rows, 0:n_cols]
+    grid_y = grid_y - center_y
+    grid_x = grid_x - center_x
+
+    # calculate the euclidean distances to the center
+    distance = np.hypot(grid_y, grid_x)
 
     # calculate the euclidean direction to the center
     # adding np.pi/2 and fixing negatives sets this to be [0, 360) clockwise from North
-    direction = np.degrees(np.arctan2(grid_x, grid_y) + np.pi / 2)
-    direction[direction < 0] = direction[direction < 0] + 360
+    direction = np.degrees(np.arctan2(grid_y, grid_x) + np.pi / 2)
+    direction[direction < 0] += 360
+
+    # values are computed in double precision, but single precision is more than
+    # sufficient for the results and halves the memory used by these (potentially
+    # large) arrays and the downstream arrays derived from them
+    distance = distance.astype("float32")
+    direction = direction.astype("float32")
+
+    distance.setflags(write=False)
+    direction.setflags(write=False)
 
     return distance, direction
 
@@ -86,25 +112,22 @@ def calc_lookangle(direction_from_turbine, turbine_bearing):
         have one element.
     """
 
-    direction_from_turbine_rad = np.radians(direction_from_turbine)
-    udir = np.sin(np.array(direction_from_turbine_rad))
-    vdir = np.cos(np.array(direction_from_turbine_rad))
-    vector_dir = np.array([udir.ravel(), vdir.ravel()])
-
-    turbine_bearing_rad = np.radians(turbine_bearing)
-    uturb = np.sin(turbine_bearing_rad)
-    vturb = np.cos(turbine_bearing_rad)
-    vector_turb = np.array([uturb, vturb])
-
-    # cast dot product to float32 to avoid very rare floating point errors
-    # that push this out of range
-    dot = np.arccos(np.dot(vector_dir.T, vector_turb).astype("float32"))
-    dot_degrees = np.degrees(dot)
+    # the lookangle is the absolute angular difference between the two directions,
+    # folded to the range [0, 180]. computing this directly (rather than via the
+    # arccos of the dot product of unit vectors) avoids floating point errors that
+    # can push the dot product out of the valid range for arccos.
+    # the difference is computed in double precision, including for float32 inputs:
+    # in single precision, wrapping negative differences into [0, 360) can round
+    # values onto the look angle class boundaries (e.g., 22.499985 to 22.5)
+    angle_diff = np.mod(
+        np.asarray(direction_from_turbine, dtype="float64") - turbine_bearing, 360
+    )
+    lookangle = np.minimum(angle_diff, 360 - angle_diff)
 
     if isinstance(direction_from_turbine, Number):
-        return dot_degrees
+        return lookangle.reshape(1)
 
-    return dot_degrees.reshape(direction_from_turbine.shape)
+    return lookangle
 
 
 def classify_look_angle(direction_from_turbine, turbine_bearing):
@@ -128,7 +151,7 @@ def classify_look_angle(direction_from_turbine, turbine_bearing):
     Returns
     -------
     numpy.ndarray
-        Return a numpy integer array with the following values: 1 (="FRONT"),
+        Return a numpy int8 array with the following values: 1 (="FRONT"),
         2 (="DIAGONAL"), 3 (="SIDE"), and -1 (="UNKNOWN"). If the input
         direction_from_turbine is an array, the size and shape of this output
         array will match. If the input is a float, the output array will have one
@@ -136,22 +159,23 @@ def classify_look_angle(direction_from_turbine, turbine_bearing):
     """
 
     lookangle = calc_lookangle(direction_from_turbine, turbine_bearing)
-    lookangle[lookangle > 90] = 180 - lookangle[lookangle > 90]
-
-    # classes: 1 = Front, 2 = Diagonal, 3 = Side, -1 = error
-    look_class = np.where(
-        (lookangle >= 0) & (lookangle < 22.5),
-        1,
-        np.where(
-            (lookangle >= 22.5) & (lookangle <= 67.5),
-            2,
-            np.where((lookangle > 67.5) & (lookangle <= 90), 3, -1),
-        ),
-    )
-    if -1 in look_class:
+
+    # lookangles are in the range [0, 180] for any finite input. anything else (e.g.,
+    # from nan inputs) cannot be classified
+    if not np.isfinite(lookangle).all():
         raise ValueError(
             "Some lookangles could not be classified for turbine_bearing "
             f"{turbine_bearing}"
         )
 
+    # classes: 1 = Front, 2 = Diagonal, 3 = Side
+    # angles > 90 are the mirror image of angles < 90 (i.e., viewing the back rather
+    # than the front of the turbine), so the class boundaries are symmetric around 90
+    # degrees. folding the angles onto [0, 90] (exactly, since 180 - lookangle is
+    # exact for lookangle in [90, 180]) reduces classification to two thresholds
+    np.minimum(lookangle, 180 - lookangle, out=lookangle)
+    look_class = np.greater_equal(lookangle, 22.5).astype("int8")
+    look_class += 1
+    look_class += lookangle > 67.5
+
     return look_class
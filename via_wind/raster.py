@@ -3,10 +3,13 @@
 raster module
 """
 import math
+import os
+from contextlib import nullcontext
+from functools import lru_cache
 
 import rasterio
+import rasterio.merge
 from osgeo import gdal
-from osgeo_utils.gdal_merge import gdal_merge
 from lxml import etree
 import geopandas as gpd
 import pyproj
@@ -35,6 +38,9 @@ GEOTIFF_PROFILE = {
     "BIGTIFF": "YES"
 }
 
+# dimensions of GeoTiff tiles must be multiples of 16
+TILE_SIZE_MULTIPLE = 16
+
 VALID_DTYPES = (
     "int8",
     "uint8",
@@ -114,6 +120,83 @@ def validate_crs_units(crs):
         )
 
 
+def geotiff_profile(dtype, shape, affine, crs, nodata_value=None):
+    """
+    Build the rasterio profile used for writing single band GeoTiffs.
+
+    Parameters
+    ----------
+    dtype : [str, numpy.dtype]
+        Data type of the output raster.
+    shape : tuple
+        Two element tuple with the (height, width) of the output raster.
+    affine : affine.Affine
+        Affine describing the raster resolution and origin.
+    crs : rasterio.crs.CRS
+        Rasterio Coordinate Reference System for the output raster.
+    nodata_value : [float, int], optional
+        Value that will be assigned to NoData in the output raster, by default None.
+
+    Returns
+    -------
+    dict
+        Profile to be passed as keyword arguments to rasterio.open().
+
+    Raises
+    ------
+    TypeError
+        A TypeError will be raised if the dtype is not a valid data type for
+        writing by rasterio.
+    """
+    dtype_name = np.dtype(dtype).name
+    if not dtype_name in VALID_DTYPES:
+        raise TypeError(
+            f"Invalid array dtype: {dtype_name}. Valid types are: {VALID_DTYPES}."
+        )
+
+    out_profile = GEOTIFF_PROFILE.copy()
+    out_profile["nodata"] = nodata_value
+    out_profile["width"] = shape[1]
+    out_profile["height"] = shape[0]
+    out_profile["crs"] = crs
+    out_profile["transform"] = affine
+    out_profile["dtype"] = dtype_name
+
+    return out_profile
+
+
+def aligned_tile_size(block_size, max_tile_size=GEOTIFF_PROFILE["blockxsize"]):
+    """
+    Find the largest GeoTiff tile size that evenly divides the specified block size,
+    so that blocks written to a tiled GeoTiff never share any tiles. GeoTiff tile
+    dimensions must be multiples of 16, so there is no such tile size unless the
+    block size is a positive multiple of 16.
+
+    Parameters
+    ----------
+    block_size : int
+        Size of the blocks that will be written.
+    max_tile_size : int, optional
+        Maximum size of the tiles, by default the tile size in GEOTIFF_PROFILE.
+
+    Returns
+    -------
+    [int, NoneType]
+        Tile size, which is a multiple of 16 and a divisor of block_size, or None if
+        block_size is not a positive multiple of 16.
+    """
+    if block_size <= 0 or block_size % TILE_SIZE_MULTIPLE != 0:
+        return None
+
+    n_units = block_size // TILE_SIZE_MULTIPLE
+    max_units = max(1, max_tile_size // TILE_SIZE_MULTIPLE)
+    tile_units = max(
+        units for units in range(1, min(n_units, max_units) + 1) if n_units % units == 0
+    )
+
+    return tile_units * TILE_SIZE_MULTIPLE
+
+
 def save_to_geotiff(array, affine, crs, out_tif, nodata_value=None, tags=None):
     """
     Save an array to a GeoTiff.
@@ -127,7 +210,8 @@ def save_to_geotiff(array, affine, crs, out_tif, nodata_value=None, tags=None):
     crs : rasterio.crs.CRS
         Rasterio Coordinate Reference System for the output raster.
     out_tif : [pathlib.Path, str]
-        Path to which the GeoTiff will be saved
+        Path to which the GeoTiff will be saved. May also be a GDAL virtual file path,
+        such as the name of a rasterio.MemoryFile, to write the GeoTiff in memory.
     nodata_value : [float, int], optional
         Value that will be assigned to NoData in the output raster, by default None.
     tags: [dict, None], optional
@@ -140,18 +224,9 @@ def save_to_geotiff(array, affine, crs, out_tif, nodata_value=None, tags=None):
         A TypeError will be raised if the input array is not a valid data type for
         writing by rasterio.
     """
-    if not array.dtype.name in VALID_DTYPES:
-        raise TypeError(
-            f"Invalid array dtype: {array.dtype}. Valid types are: {VALID_DTYPES}."
-        )
-
-    out_profile = GEOTIFF_PROFILE.copy()
-    out_profile["nodata"] = nodata_value
-    out_profile["width"] = array.shape[1]
-    out_profile["height"] = array.shape[0]
-    out_profile["crs"] = crs
-    out_profile["transform"] = affine
-    out_profile["dtype"] = array.dtype.name
+    out_profile = geotiff_profile(
+        array.dtype, array.shape, affine, crs, nodata_value=nodata_value
+    )
 
     with rasterio.open(out_tif, "w", **out_profile) as out_rast:
         out_rast.write(array, 1)
@@ -195,7 +270,9 @@ def create_vrt(tif_dir_path, out_vrt_path, pattern="*.tif"):
     return vrt
 
 
-def merge_tifs(tifs_path, out_tif_path, pattern="*.tif"):
+def merge_tifs(
+    tifs_path, out_tif_path, pattern="*.tif", tags=None, creation_options=None
+):
     """
     Merge the geotiffs in an input directory to a single GeoTiff.
 
@@ -205,21 +282,108 @@ def merge_tifs(tifs_path, out_tif_path, pattern="*.tif"):
         Path to directory containing GeoTiffs
     out_tif_path : pathlib.Path
         Path for output merged GeoTiff
+    pattern : str, optional
+        File pattern used to find the GeoTiffs to merge, by default "*.tif".
+    tags : [dict, NoneType], optional
+        Metadata tags to add to the output GeoTiff, by default None.
+    creation_options : [dict, NoneType], optional
+        GeoTiff creation options (e.g., compression and tiling) for the output
+        GeoTiff, by default None. See merge_rasters() for details.
     """
 
-    args = [
-        "",
-        "-o",
-        out_tif_path.as_posix(),
-        "-co",
-        "COMPRESS=DEFLATE",
-        "-co",
-        "BIGTIFF=YES",
-        "-quiet",
-    ]
     tifs = [t.as_posix() for t in tifs_path.rglob(pattern)]
-    args.extend(tifs)
-    gdal_merge(args)
+    merge_rasters(tifs, out_tif_path, tags=tags, creation_options=creation_options)
+
+
+def merge_rasters(sources, out_tif_path, tags=None, creation_options=None):
+    """
+    Merge rasters to a single GeoTiff. The output will have the data type, resolution,
+    and other properties of the first raster, and the combined extent of all of the
+    rasters.
+
+    Parameters
+    ----------
+    sources : list
+        List of rasters to merge. Rasters may be specified as paths or as rasterio
+        datasets opened in "r" mode (including datasets opened from a
+        rasterio.MemoryFile).
+    out_tif_path : [pathlib.Path, str]
+        Path for output merged GeoTiff. May also be a GDAL virtual file path, such as
+        the name of a rasterio.MemoryFile, to write the GeoTiff in memory.
+    tags : [dict, NoneType], optional
+        Metadata tags to add to the output GeoTiff, by default None. Tags are written
+        when the GeoTiff is created, so the output does not need to be reopened to
+        add them.
+    creation_options : [dict, NoneType], optional
+        GeoTiff creation options for the output GeoTiff, by default None. These are
+        applied on top of the profile of the first raster and the default options
+        (deflate compression and BIGTIFF), e.g., {"compress": "zstd",
+        "blockxsize": 512, "blockysize": 512}.
+
+    Raises
+    ------
+    ValueError
+        A ValueError will be raised if sources is empty.
+    """
+
+    profile = _merged_profile(sources)
+    profile.update(driver="GTiff", compress="deflate", BIGTIFF="YES")
+    if creation_options is not None:
+        profile.update(creation_options)
+    # the output is created here, rather than by rasterio.merge.merge(), so that the
+    # tags can be set before any data is written
+    with rasterio.open(out_tif_path, "w", **profile) as dst:
+        if tags is not None:
+            dst.update_tags(**tags)
+        rasterio.merge.merge(sources, dst_path=dst)
+
+
+def _merged_profile(sources):
+    """
+    Build the profile of the GeoTiff created by rasterio.merge.merge() with its default
+    settings: the profile of the first raster, with the combined extent of all of the
+    rasters at the resolution of the first raster.
+
+    Parameters
+    ----------
+    sources : list
+        List of rasters to merge. Rasters may be specified as paths or as rasterio
+        datasets opened in "r" mode.
+
+    Returns
+    -------
+    dict
+        Rasterio profile of the first raster, with the transform, width, and height
+        updated to cover the combined extent of all of the rasters.
+
+    Raises
+    ------
+    ValueError
+        A ValueError will be raised if sources is empty.
+    """
+    if len(sources) == 0:
+        raise ValueError("No source rasters to merge")
+
+    xs = []
+    ys = []
+    for i, source in enumerate(sources):
+        is_path = isinstance(source, (str, os.PathLike))
+        with (rasterio.open if is_path else nullcontext)(source) as src:
+            if i == 0:
+                profile = src.profile
+                res = src.res
+            left, bottom, right, top = src.bounds
+        xs.extend([left, right])
+        ys.extend([bottom, top])
+
+    west, south, east, north = min(xs), min(ys), max(xs), max(ys)
+    profile.update(
+        transform=rasterio.transform.from_origin(west, north, res[0], res[1]),
+        width=int(round((east - west) / res[0])),
+        height=int(round((north - south) / res[1])),
+    )
+
+    return profile
 
 
 def read_vrt_sources(vrt_path):
@@ -229,7 +393,7 @@ def read_vrt_sources(vrt_path):
 
     Parameters
     ----------
-    vrt_source : [str, pathlib.Path]
+    vrt_path : [str, pathlib.Path]
         Path to source VRT file.
 
     Returns
@@ -238,15 +402,51 @@ def read_vrt_sources(vrt_path):
         GeoDataFrame where each row contains information about a source raster included
         in the VRT, including the raster filepath and its bounds in pixel coordinates
         relative to the VRT extent as both a tuple and a geometry.
+
+    Notes
+    -----
+    Parsed results are cached based on the VRT path and its modification time, so
+    reading the same unmodified VRT repeatedly only parses it once. Each call returns a
+    copy of the cached result that is safe to modify.
+    """
+
+    vrt_path = os.path.realpath(vrt_path)
+    vrt_sources_df = _read_vrt_sources(vrt_path, os.stat(vrt_path).st_mtime_ns)
+
+    return vrt_sources_df.copy()
+
+
+@lru_cache(maxsize=16)
+def _read_vrt_sources(vrt_path, mtime_ns):
+    # pylint: disable=unused-argument
+    """
+    Cached implementation of read_vrt_sources().
+
+    Parameters
+    ----------
+    vrt_path : str
+        Path to source VRT file.
+    mtime_ns : int
+        Modification time of the VRT file in nanoseconds. Only used as part of the
+        cache key, so that modified files are re-read.
+
+    Returns
+    -------
+    geopandas.GeoDataFrame
+        GeoDataFrame where each row contains information about a source raster included
+        in the VRT. This is shared between calls, so it should not be modified.
     """
 
     vrt_tree = etree.parse(vrt_path)
     vrt_root = vrt_tree.getroot()
-    raster_sources = vrt_root.findall(".//SimpleSource")
+    # gdal.BuildVRT() writes ComplexSource elements instead of SimpleSource elements
+    # for sources that need additional handling (e.g., with NoData values). both are
+    # found in a single pass, in the order they appear in the VRT
+    raster_sources = vrt_root.xpath(".//SimpleSource | .//ComplexSource")
     vrt_source_info = []
     for raster_source in raster_sources:
-        src_file = raster_source.findall("SourceFilename")[0].text
-        dst_rect = {k: int(v) for k, v in raster_source.findall("DstRect")[0].items()}
+        src_file = raster_source.find("SourceFilename").text
+        dst_rect = {k: int(v) for k, v in raster_source.find("DstRect").items()}
         bounds = [
             dst_rect["xOff"],
             dst_rect["yOff"],
@@ -261,6 +461,49 @@ def read_vrt_sources(vrt_path):
     return vrt_sources_df
 
 
+def find_blocks_with_sources(vrt_sources_df, full_profile, offsets, block_size):
+    """
+    Find the blocks of a VRT that intersect at least one of its source rasters.
+    Blocks are defined the same way as in mosaic_block(), and all blocks are checked
+    against all source rasters at once, based on their bounds.
+
+    Parameters
+    ----------
+    vrt_sources_df : geopandas.GeoDataFrame
+        GeoDataFrame containing information about the source rasters to mosaic
+        and their bounds relative to the full VRT. Typically from read_vrt_sources().
+    full_profile : dict
+        Rasterio Profile of the full VRT.
+    offsets : numpy.ndarray
+        Two dimensional array with one row per block, containing the (row offset,
+        column offset) where the block starts, relative to the top left of the VRT.
+    block_size : int
+        Size of the blocks.
+
+    Returns
+    -------
+    numpy.ndarray
+        Subset of the rows of offsets for blocks that intersect at least one source
+        raster.
+    """
+    row_offsets = offsets[:, [0]]
+    col_offsets = offsets[:, [1]]
+    block_xmax = np.minimum(col_offsets + block_size, full_profile["width"])
+    # includes the extra row added to each block by mosaic_block()
+    block_ymax = np.minimum(row_offsets + block_size, full_profile["height"]) + 1
+
+    src_bounds = np.array(vrt_sources_df["bounds"].tolist()).reshape(-1, 4)
+    # boxes intersect (including touching edges) if they overlap along both axes
+    intersects = (
+        (src_bounds[:, 0] <= block_xmax)
+        & (src_bounds[:, 2] >= col_offsets)
+        & (src_bounds[:, 1] <= block_ymax)
+        & (src_bounds[:, 3] >= row_offsets)
+    )
+
+    return offsets[intersects.any(axis=1)]
+
+
 def mosaic_block(
     vrt_sources_df, full_profile, out_path, col_offset, row_offset, block_size
 ):
@@ -285,6 +528,11 @@ def mosaic_block(
         Row offset where the block starts, relative to the top left of the VRT.
     block_size : int
         Size of the block to mosaic.
+
+    Returns
+    -------
+    pathlib.Path
+        Path to the output mosaicked block.
     """
 
     out_tif_path = out_path.joinpath(f"block_{row_offset}_{col_offset}.tif")
@@ -359,3 +607,5 @@ def mosaic_block(
 
     with rasterio.open(out_tif_path, "w", **out_profile) as out_rast:
         out_rast.write(block_array[:-1, :], 1)
+
+    return out_tif_path
@@ -3,8 +3,10 @@
 utils module
 """
 import datetime
-import time
+import os
 from pathlib import Path
+import stat
+import time
 
 
 def verify_directory(directory):
@@ -23,9 +25,14 @@ def verify_directory(directory):
     TypeError
         A TypeError will be raised if the input path is not a folder.
     """
-    if Path(directory).exists() is False:
-        raise FileNotFoundError(f"Input directory {directory} could not be found.")
-    if Path(directory).is_dir() is False:
+    # a single stat call both checks existence and retrieves the file type
+    try:
+        mode = os.stat(directory).st_mode
+    except (FileNotFoundError, NotADirectoryError) as e:
+        raise FileNotFoundError(
+            f"Input directory {directory} could not be found."
+        ) from e
+    if not stat.S_ISDIR(mode):
         raise TypeError(f"Input directory {directory} is not a folder.")
 
 
@@ -45,7 +52,49 @@ def verify_file(fpath):
     TypeError
         A TypeError will be raised if the input path is not a file.
     """
-    if Path(fpath).exists() is False:
-        raise FileNotFoundError(f"Input fpath {fpath} could not be found.")
-    if Path(fpath).is_dir() is True:
+    # a single stat call both checks existence and retrieves the file type
+    try:
+        mode = os.stat(fpath).st_mode
+    except (FileNotFoundError, NotADirectoryError) as e:
+        raise FileNotFoundError(f"Input fpath {fpath} could not be found.") from e
+    if stat.S_ISDIR(mode):
         raise TypeError(f"Input fpath {fpath} is not a file.")
+
+
+def find_missing_paths(paths):
+    """
+    Find which of the input paths do not exist. Paths are grouped by their parent
+    folder, and each folder is listed once, rather than checking every path
+    separately.
+
+    Parameters
+    ----------
+    paths : list
+        List of paths to files or folders, as str or pathlib.Path.
+
+    Returns
+    -------
+    list
+        Input paths that do not exist, in their input order.
+    """
+    listings = {}
+    missing_paths = []
+    for path in paths:
+        parent = Path(path).parent
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    # symbolic links are left out, so that they are checked below
+                    listings[parent] = {
+                        entry.name for entry in entries if not entry.is_symlink()
+                    }
+            except (FileNotFoundError, NotADirectoryError):
+                listings[parent] = set()
+
+        # paths that are not in the listing of their parent folder are checked
+        # directly, which handles symbolic links, special names (e.g., "..") and case
+        # insensitive file systems
+        if Path(path).name not in listings[parent] and not Path(path).exists():
+            missing_paths.append(path)
+
+    return missing_paths
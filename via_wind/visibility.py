@@ -130,14 +130,20 @@ def check_columns(df, required_columns):
     Raises
     ------
     KeyError
-        A KeyError will be raised if one of the required columns is missing.
+        A KeyError will be raised if any of the required columns are missing. The error
+        message lists all of the missing columns.
     ValueError
         A ValueError will be raised if one of the required column checks does not pass.
     """
-    for col in required_columns:
-        dtype_checker, dtype_msg = required_columns[col]
-        if col not in df.columns:
-            raise KeyError(f"Required column {col} not found in dataframe")
+    missing_cols = [col for col in required_columns if col not in df.columns]
+    if len(missing_cols) == 1:
+        raise KeyError(f"Required column {missing_cols[0]} not found in dataframe")
+    if len(missing_cols) > 1:
+        raise KeyError(
+            f"Required columns {', '.join(missing_cols)} not found in dataframe"
+        )
+
+    for col, (dtype_checker, dtype_msg) in required_columns.items():
         if not dtype_checker(df[col]):
             raise ValueError(f"Invalid values for column {col}: {dtype_msg}")
 